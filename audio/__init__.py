@@ -0,0 +1,14 @@
+from .endpointing import EndpointProfile, PROFILES, DEFAULT_PROFILE, SilenceDetector, apply_endpointing
+from .multi_capture import MultiDeviceTranscriber, Segment
+from .preprocessing import AudioPreprocessor
+from .sources import (
+    AudioSource, MicrophoneSource, StreamSource, RawFileSource, WavFileSource,
+    StdinSource, FifoSource, open_source
+)
+
+__all__ = [
+    'AudioPreprocessor', 'MultiDeviceTranscriber', 'Segment',
+    'EndpointProfile', 'PROFILES', 'DEFAULT_PROFILE', 'SilenceDetector', 'apply_endpointing',
+    'AudioSource', 'MicrophoneSource', 'StreamSource', 'RawFileSource',
+    'WavFileSource', 'StdinSource', 'FifoSource', 'open_source'
+]
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class EndpointProfile:
+    """How eagerly an utterance is considered finished.
+
+    ``vosk_mode`` and the three delays are passed to the recognizer's own
+    endpointer when the installed Vosk has one. Independently, a silence
+    detector forces a final result once ``silence_duration`` seconds of
+    silence follow at least ``min_speech`` seconds of speech; a
+    ``silence_duration`` of None leaves finalizing to the recognizer.
+    ``decode_blocks`` is how many capture blocks are batched per decode.
+    """
+
+    def __init__(self, name, vosk_mode=None, t_start_max=None, t_end=None, t_max=None,
+                 silence_duration=None, silence_threshold=0.01, min_speech=0.3, decode_blocks=4):
+        self.name = name
+        self.vosk_mode = vosk_mode
+        self.t_start_max = t_start_max
+        self.t_end = t_end
+        self.t_max = t_max
+        self.silence_duration = silence_duration
+        self.silence_threshold = silence_threshold
+        self.min_speech = min_speech
+        self.decode_blocks = decode_blocks
+
+
+PROFILES = {
+    # Model defaults, as Parspeak behaved before profiles existed
+    "default": EndpointProfile("default"),
+    "fast": EndpointProfile("fast", vosk_mode="SHORT", t_start_max=5.0, t_end=0.3, t_max=10.0,
+                            silence_duration=0.4, decode_blocks=1),
+    "balanced": EndpointProfile("balanced", vosk_mode="DEFAULT", t_start_max=5.0, t_end=0.5, t_max=20.0,
+                                silence_duration=0.7, decode_blocks=2),
+    "dictation": EndpointProfile("dictation", vosk_mode="LONG", t_start_max=10.0, t_end=1.0, t_max=30.0,
+                                 silence_duration=1.2, decode_blocks=4),
+}
+DEFAULT_PROFILE = "balanced"
+
+
+def apply_endpointing(rec, profile):
+    """Configure the recognizer's endpointer; returns False if Vosk has none"""
+    if profile.vosk_mode is None or not hasattr(rec, "SetEndpointerMode"):
+        return False
+    try:
+        from vosk import EndpointerMode
+        rec.SetEndpointerMode(getattr(EndpointerMode, profile.vosk_mode))
+        if profile.t_end is not None and hasattr(rec, "SetEndpointerDelays"):
+            rec.SetEndpointerDelays(profile.t_start_max, profile.t_end, profile.t_max)
+    except (ImportError, AttributeError):
+        return False
+    return True
+
+
+class SilenceDetector:
+    """Signal an early finalize after trailing silence that follows speech.
+
+    Levels are measured on 10 ms frames, vectorized per block.
+    """
+
+    def __init__(self, profile, samplerate=16000):
+        self.profile = profile
+        self.frame_size = samplerate // 100
+        self.frame_time = self.frame_size / samplerate
+        self.reset()
+
+    def reset(self):
+        self.speech_time = 0.0
+        self.silence_time = 0.0
+
+    def update(self, audio_data):
+        """Feed int16 bytes; returns True when the utterance should be finalized"""
+        if self.profile.silence_duration is None:
+            return False
+        audio = np.frombuffer(audio_data, dtype=np.int16)
+        frames = audio[:audio.size - audio.size % self.frame_size].reshape(-1, self.frame_size)
+        if frames.size == 0:
+            return False
+        levels = np.sqrt(np.mean((frames.astype(np.float32) / 32768.0) ** 2, axis=1))
+        voiced = np.flatnonzero(levels > self.profile.silence_threshold)
+        if voiced.size:
+            # Only the silence after the last voiced frame counts as trailing
+            self.speech_time += voiced.size * self.frame_time
+            self.silence_time = (len(levels) - 1 - voiced[-1]) * self.frame_time
+        else:
+            self.silence_time += len(levels) * self.frame_time
+
+        if self.speech_time >= self.profile.min_speech and self.silence_time >= self.profile.silence_duration:
+            self.reset()
+            return True
+        return False
@@ -0,0 +1,203 @@
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from vosk import KaldiRecognizer
+
+from transcript import RecognitionResult
+
+from .preprocessing import AudioPreprocessor
+from .sources import BYTES_PER_SAMPLE
+
+logger = logging.getLogger(__name__)
+
+
+class Segment:
+    """A final result from one stream, stamped with the stream time it started at.
+
+    ``result`` holds the word timings; ``time`` falls back to the time the
+    result arrived when the recognizer reported no words.
+    """
+
+    __slots__ = ("label", "time", "text", "result")
+
+    def __init__(self, label, time, text, result=None):
+        self.label = label
+        self.time = time
+        self.text = text
+        self.result = result
+
+    def __repr__(self):
+        return f"Segment({self.label!r}, {self.time:.2f}, {self.text!r})"
+
+
+class _Channel:
+    # Per-stream state: each channel owns its preprocessor and recognizer,
+    # and at most one pool task decodes it at a time
+    def __init__(self, label, source, model, preprocess, max_pending):
+        self.label = label
+        self.source = source
+        self.model = model
+        self.preprocessor = AudioPreprocessor(samplerate=source.samplerate) if preprocess else None
+        self.recognizer = None
+        self.pending = deque()
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.scheduled = False
+        self.finished = False
+        self.samples = 0
+        self.error = None  # Set when decoding failed; the channel is then dropped
+        self.lock = threading.Lock()
+        self.space = threading.Condition(self.lock)  # Notified when a pending block is taken
+
+
+class MultiDeviceTranscriber:
+    """Transcribe several audio sources at once with one shared Model.
+
+    A reader thread per source collects blocks; decoding runs on a thread
+    pool sized to the CPU count. Vosk releases the GIL while decoding, so
+    streams decode in parallel. Final segments are passed to ``on_segment``
+    as they arrive and can be read back in time order with ``transcript``.
+
+    At most ``max_pending`` blocks wait per stream. When decoding falls
+    behind, readers of file sources wait, and live sources drop their
+    oldest blocks.
+    """
+
+    def __init__(self, model, sources, on_segment=None, max_workers=None, preprocess=True,
+                 max_pending=64):
+        self.model = model
+        self.on_segment = on_segment
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.channels = [_Channel(label, source, model, preprocess, max_pending)
+                         for label, source in sources]
+        self.segments = []
+        self._segments_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._pool = None
+        self._readers = []
+
+    def start(self):
+        self._stop_event.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="decoder")
+        for channel in self.channels:
+            channel.source.start()
+            # Created after start so file sources report their real sample rate
+            channel.recognizer = KaldiRecognizer(self.model, channel.source.samplerate)
+            channel.recognizer.SetWords(True)
+            reader = threading.Thread(target=self._read, args=(channel,),
+                                      name=f"reader-{channel.label}", daemon=True)
+            reader.start()
+            self._readers.append(reader)
+
+    def stop(self):
+        """Stop reading, finish decoding queued audio and flush final results"""
+        self._stop_event.set()
+        self.wait()
+
+    def wait(self):
+        """Block until every source has ended and all audio is decoded.
+
+        Raises RuntimeError if decoding any of the streams failed.
+        """
+        for reader in self._readers:
+            reader.join()
+        self._readers = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        for channel in self.channels:
+            channel.source.stop()
+        for channel in self.channels:
+            if channel.error is not None:
+                raise RuntimeError(f"Decoding {channel.label} failed") from channel.error
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _read(self, channel):
+        while not self._stop_event.is_set() and channel.error is None:
+            block = channel.source.read(timeout=0.1)
+            if block is None:
+                continue
+            if not block:
+                break
+            self._submit(channel, block)
+        self._submit(channel, None)
+
+    def _submit(self, channel, block):
+        # A None block marks the end of the stream
+        with channel.lock:
+            # The end marker always goes in, so the final result is flushed
+            while block is not None and len(channel.pending) >= channel.max_pending:
+                if channel.error is not None:
+                    break
+                if channel.source.live:
+                    channel.pending.popleft()
+                    channel.dropped += 1
+                    logger.warning("Decoding %s fell behind; dropped %d blocks so far",
+                                   channel.label, channel.dropped)
+                else:
+                    channel.space.wait()
+            if channel.error is not None:
+                return
+            channel.pending.append(block)
+            if channel.scheduled:
+                return
+            channel.scheduled = True
+        self._pool.submit(self._decode, channel)
+
+    def _decode(self, channel):
+        failed = True
+        try:
+            while True:
+                with channel.lock:
+                    if not channel.pending:
+                        # Cleared under the lock so _submit reschedules new blocks
+                        channel.scheduled = False
+                        failed = False
+                        return
+                    block = channel.pending.popleft()
+                    channel.space.notify()
+                if block is None:
+                    if not channel.finished:
+                        channel.finished = True
+                        self._emit(channel, channel.recognizer.FinalResult())
+                    continue
+                channel.samples += len(block) // BYTES_PER_SAMPLE
+                data = channel.preprocessor.process(block) if channel.preprocessor else bytes(block)
+                if channel.recognizer.AcceptWaveform(data):
+                    self._emit(channel, channel.recognizer.Result())
+        except Exception as e:
+            logger.exception("Decoding %s failed", channel.label)
+            channel.error = e
+        finally:
+            if failed:
+                # Drop the channel's audio so it can't pile up, and unblock _submit
+                with channel.lock:
+                    channel.error = channel.error or RuntimeError("decoder stopped")
+                    channel.pending.clear()
+                    channel.scheduled = False
+                    channel.space.notify_all()
+
+    def _emit(self, channel, result_json):
+        result = RecognitionResult.from_json(result_json)
+        if not result:
+            return
+        time = result.start if len(result) else channel.samples / channel.source.samplerate
+        segment = Segment(channel.label, time, result.text, result)
+        with self._segments_lock:
+            self.segments.append(segment)
+        if self.on_segment is not None:
+            self.on_segment(segment)
+
+    def transcript(self):
+        """Return all segments merged in stream-time order"""
+        with self._segments_lock:
+            return sorted(self.segments, key=lambda segment: segment.time)
@@ -0,0 +1,98 @@
+import numpy as np
+
+
+class AudioPreprocessor:
+    """Stateful DC blocker, automatic gain control and noise gate for int16 blocks.
+
+    All processing is done per block with NumPy; state (DC estimate, noise
+    floor and current gain) carries over between blocks so one instance
+    should be used per recording stream and reset when a new recording starts.
+    The gain only adapts on blocks that stand out from the tracked noise
+    floor; on other blocks it decays slowly back towards unity.
+    """
+
+    def __init__(self, samplerate=16000, target_rms=0.1, min_gain=0.5, max_gain=8.0,
+                 attack_time=0.05, release_time=0.8, dc_time=0.5, noise_gate=0.003,
+                 speech_ratio=3.0, noise_rise_time=5.0, noise_fall_time=0.2, hold_time=3.0,
+                 max_speech_time=20.0):
+        self.samplerate = samplerate
+        self.target_rms = target_rms
+        self.min_gain = min_gain
+        self.max_gain = max_gain
+        self.attack_time = attack_time    # Seconds to pull the gain down on loud input
+        self.release_time = release_time  # Seconds to let the gain recover on quiet input
+        self.dc_time = dc_time            # Seconds for the DC estimate to settle
+        self.noise_gate = noise_gate
+        self.speech_ratio = speech_ratio        # Block RMS over the noise floor that counts as speech
+        self.noise_rise_time = noise_rise_time  # Seconds for the floor to follow rising noise
+        self.noise_fall_time = noise_fall_time  # Seconds for the floor to follow falling noise
+        self.hold_time = hold_time              # Seconds for the gain to drift back to 1 without speech
+        self.max_speech_time = max_speech_time  # Seconds of unbroken "speech" before the floor may rise anyway
+        self.reset()
+
+    def reset(self):
+        """Forget the DC estimate and noise floor and return to unity gain"""
+        self.dc_offset = 0.0
+        self.noise_floor = self.noise_gate
+        self.speech_time = 0.0
+        self.gain = 1.0
+
+    def _smoothing(self, block_time, time_constant):
+        # One-pole coefficient for a block of the given length
+        return 1.0 - np.exp(-block_time / time_constant)
+
+    def process(self, audio_data):
+        """Process a block of raw int16 bytes and return int16 bytes"""
+        audio = np.frombuffer(audio_data, dtype=np.int16)
+        if audio.size == 0:
+            return audio_data
+
+        # Convert to float32 for processing
+        audio = audio.astype(np.float32) / 32768.0
+        block_time = audio.size / self.samplerate
+
+        # DC removal: track the block mean with a slow one-pole filter and
+        # ramp the correction so a changing estimate doesn't step at block edges
+        prev_dc = self.dc_offset
+        self.dc_offset += self._smoothing(block_time, self.dc_time) * (float(audio.mean()) - self.dc_offset)
+        if self.dc_offset != prev_dc:
+            audio -= np.linspace(prev_dc, self.dc_offset, audio.size, dtype=np.float32)
+        else:
+            audio -= self.dc_offset
+
+        # Classify against the floor so far, then track it: follow quiet blocks
+        # quickly and loud ones slowly. The floor doesn't rise during speech,
+        # unless "speech" lasts so long that the noise itself must have risen
+        rms = float(np.sqrt(np.mean(audio * audio)))
+        is_speech = rms > max(self.noise_gate, self.noise_floor * self.speech_ratio)
+        self.speech_time = self.speech_time + block_time if is_speech else 0.0
+        if rms < self.noise_floor:
+            self.noise_floor += self._smoothing(block_time, self.noise_fall_time) * (rms - self.noise_floor)
+        elif not is_speech or self.speech_time > self.max_speech_time:
+            self.noise_floor += self._smoothing(block_time, self.noise_rise_time) * (rms - self.noise_floor)
+
+        # Noise gate on the input level so the AGC never amplifies the noise floor
+        mask = np.abs(audio) > self.noise_gate
+        audio *= mask
+
+        # Only adapt the gain on speech; otherwise let it drift back to unity
+        prev_gain = self.gain
+        if is_speech:
+            rms = float(np.sqrt(np.mean(audio * audio)))
+            desired = min(max(self.target_rms / rms, self.min_gain), self.max_gain)
+            time_constant = self.attack_time if desired < self.gain else self.release_time
+            self.gain += self._smoothing(block_time, time_constant) * (desired - self.gain)
+        else:
+            self.gain += self._smoothing(block_time, self.hold_time) * (1.0 - self.gain)
+
+        # Ramp the gain across the block to avoid zipper noise at block edges
+        if self.gain != prev_gain:
+            audio *= np.linspace(prev_gain, self.gain, audio.size, dtype=np.float32)
+        else:
+            audio *= self.gain
+
+        # Clip to prevent distortion
+        np.clip(audio, -1.0, 1.0, out=audio)
+
+        # Convert back to int16
+        return (audio * 32767).astype(np.int16).tobytes()
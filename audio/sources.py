@@ -0,0 +1,295 @@
+import logging
+import os
+import queue
+import select
+import sys
+import time
+import wave
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):  # No PortAudio on headless boxes
+    sd = None
+
+BYTES_PER_SAMPLE = 2  # All sources deliver mono int16
+
+logger = logging.getLogger(__name__)
+
+
+class AudioSource:
+    """Base class for anything that produces mono int16 PCM blocks.
+
+    ``read`` returns one block, ``None`` when no block arrived within the
+    timeout, or an empty ``bytes`` at the end of the stream. Blocks are
+    filled in place with ``readinto`` where the source allows it, so each
+    block is a fresh buffer that consumers may keep without copying.
+    ``live`` sources keep producing whether or not they are read, so a slow
+    consumer has to drop their audio rather than wait.
+    """
+
+    live = False
+
+    def __init__(self, samplerate=16000, blocksize=4000):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+
+    @property
+    def block_bytes(self):
+        return self.blocksize * BYTES_PER_SAMPLE
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def read(self, timeout=None):
+        raise NotImplementedError
+
+    def clear(self):
+        """Discard audio buffered since the last read"""
+        pass
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def __iter__(self):
+        while True:
+            block = self.read()
+            if block is None:
+                continue
+            if not block:
+                return
+            yield block
+
+
+class MicrophoneSource(AudioSource):
+    """Capture from a sounddevice input device.
+
+    At most ``max_buffer`` seconds of audio are kept; when nobody reads
+    (e.g. while the app is idle) the oldest blocks are dropped.
+    """
+
+    live = True
+
+    def __init__(self, device=None, samplerate=16000, blocksize=4000, max_buffer=10.0):
+        super().__init__(samplerate, blocksize)
+        self.device = device
+        self.queue = queue.Queue(maxsize=max(1, int(max_buffer * samplerate / blocksize)))
+        self.stream = None
+
+    def _callback(self, indata, frames, time, status):
+        # Runs on the PortAudio thread: the log call only enqueues, and
+        # repeated overflow reports are rate limited
+        if status:
+            logger.warning("Audio input status: %s", status)
+        # PortAudio reuses indata, so this is the one copy we must make
+        data = bytes(indata)
+        while True:
+            try:
+                self.queue.put_nowait(data)
+                return
+            except queue.Full:
+                # Drop the oldest block rather than grow without bound
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def start(self):
+        if sd is None:
+            raise RuntimeError("sounddevice is not available; use a file, stdin or FIFO source")
+        self.stream = sd.RawInputStream(samplerate=self.samplerate,
+                                        blocksize=self.blocksize,
+                                        device=self.device,
+                                        dtype="int16",
+                                        channels=1,
+                                        callback=self._callback)
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def read(self, timeout=None):
+        try:
+            if timeout == 0:
+                return self.queue.get_nowait()
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def clear(self):
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class StreamSource(AudioSource):
+    """Read raw mono int16 PCM from a binary file object.
+
+    With ``paced`` set, blocks are released at real-time speed as if they
+    came from a microphone; otherwise the stream is read as fast as possible.
+    A read with a timeout waits on pipes with ``select``; a block that is
+    only partly filled when it runs out is completed by the next read.
+    """
+
+    def __init__(self, fileobj=None, samplerate=16000, blocksize=4000, paced=False):
+        super().__init__(samplerate, blocksize)
+        self.fileobj = fileobj
+        self.paced = paced
+        self.samples_read = 0
+        self._next_block_time = None
+        self._buffer = None  # Block being filled, kept across timed out reads
+        self._filled = 0
+
+    def _open(self):
+        return self.fileobj
+
+    def start(self):
+        if self.fileobj is None:
+            self.fileobj = self._open()
+        self._next_block_time = time.monotonic()
+
+    def _wait_readable(self, deadline):
+        if deadline is None:
+            return True
+        try:
+            fd = self.fileobj.fileno()
+        except (AttributeError, OSError, ValueError):
+            return True  # In-memory streams never stall
+        try:
+            ready, _, _ = select.select([fd], [], [], max(0.0, deadline - time.monotonic()))
+        except (OSError, ValueError):
+            return True  # select() only takes sockets on Windows
+        return bool(ready)
+
+    def _fill(self, deadline):
+        # Pipes return short reads, so keep going until the block is full;
+        # returns False if the deadline passed first
+        view = memoryview(self._buffer)
+        while self._filled < len(view):
+            if not self._wait_readable(deadline):
+                return False
+            count = self.fileobj.readinto(view[self._filled:])
+            if not count:
+                break
+            self._filled += count
+        return True
+
+    def read(self, timeout=None):
+        if self._buffer is None:
+            self._buffer = bytearray(self.block_bytes)
+            self._filled = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._fill(deadline):
+            return None
+        buffer, filled = self._buffer, self._filled
+        self._buffer = None
+        # Drop a trailing odd byte rather than split a sample
+        filled -= filled % BYTES_PER_SAMPLE
+        if filled == 0:
+            return b""
+        self.samples_read += filled // BYTES_PER_SAMPLE
+        if self.paced:
+            self._next_block_time += filled / BYTES_PER_SAMPLE / self.samplerate
+            delay = self._next_block_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return memoryview(buffer)[:filled]
+
+    def stop(self):
+        if self.fileobj is not None:
+            self.fileobj.close()
+            self.fileobj = None
+
+
+class RawFileSource(StreamSource):
+    """Headerless mono int16 PCM file"""
+
+    def __init__(self, path, samplerate=16000, blocksize=4000, paced=False):
+        super().__init__(None, samplerate, blocksize, paced)
+        self.path = path
+
+    def _open(self):
+        return open(self.path, "rb", buffering=0)
+
+
+class WavFileSource(StreamSource):
+    """Mono 16-bit WAV file; the sample rate is taken from the header"""
+
+    def __init__(self, path, blocksize=4000, paced=False):
+        super().__init__(None, 16000, blocksize, paced)
+        self.path = path
+        self.wave_file = None
+
+    def _open(self):
+        self.wave_file = wave.open(self.path, "rb")
+        if self.wave_file.getnchannels() != 1 or self.wave_file.getsampwidth() != BYTES_PER_SAMPLE:
+            self.wave_file.close()
+            raise ValueError(f"{self.path}: audio file must be WAV format mono PCM 16-bit")
+        self.samplerate = self.wave_file.getframerate()
+        return self.wave_file
+
+    def _fill(self, deadline):
+        # wave has no readinto, so copy frames into the block buffer
+        data = self.wave_file.readframes(self.blocksize)
+        self._buffer[:len(data)] = data
+        self._filled = len(data)
+        return True
+
+
+class StdinSource(StreamSource):
+    """Raw mono int16 PCM from standard input, e.g. piped from arecord or ffmpeg"""
+
+    def __init__(self, samplerate=16000, blocksize=4000, paced=False):
+        super().__init__(None, samplerate, blocksize, paced)
+
+    def _open(self):
+        return os.fdopen(sys.stdin.fileno(), "rb", buffering=0, closefd=False)
+
+
+class FifoSource(RawFileSource):
+    """Raw mono int16 PCM from a named pipe.
+
+    When ``reopen`` is set, a writer closing the pipe does not end the
+    stream; the source waits for the next writer instead. The pipe is then
+    also held open for writing, so it never reports end of file and opening
+    it doesn't wait for a writer.
+    """
+
+    def __init__(self, path, samplerate=16000, blocksize=4000, reopen=False):
+        super().__init__(path, samplerate, blocksize, paced=False)
+        self.reopen = reopen
+
+    def _open(self):
+        if not os.path.exists(self.path):
+            os.mkfifo(self.path)
+        if self.reopen:
+            return os.fdopen(os.open(self.path, os.O_RDWR), "rb", buffering=0)
+        # Blocks until a writer opens the pipe
+        return open(self.path, "rb", buffering=0)
+
+
+def open_source(spec, samplerate=16000, blocksize=4000, paced=False, device=None):
+    """Build a source from a command line spec.
+
+    ``mic``, ``-`` (stdin), ``fifo:PATH``, or a path to a .wav or raw PCM file.
+    """
+    if spec == "mic":
+        return MicrophoneSource(device, samplerate, blocksize)
+    if spec == "-":
+        return StdinSource(samplerate, blocksize, paced)
+    if spec.startswith("fifo:"):
+        return FifoSource(spec[len("fifo:"):], samplerate, blocksize)
+    if spec.lower().endswith(".wav"):
+        return WavFileSource(spec, blocksize, paced)
+    return RawFileSource(spec, samplerate, blocksize, paced)
@@ -0,0 +1,267 @@
+"""Unattended batch transcription of a folder of recordings.
+
+Watches a folder, decodes new recordings on a pool of worker processes
+(each loading the model once) and records every finished file in a SQLite
+manifest keyed by content hash. After a crash or restart, files that are
+already done, even if renamed or copied, are skipped.
+
+    python batch.py /srv/recordings --output /srv/transcripts --workers 4
+    python batch.py /srv/recordings --once   # work through the backlog and exit
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from audio import StreamSource, WavFileSource
+from transcriber import MODEL_PATH, load_model, transcribe
+from transcript import normalize_segment
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = {".wav", ".raw", ".pcm", ".mp3", ".ogg", ".opus", ".flac", ".m4a", ".webm"}
+RAW_EXTENSIONS = {".raw", ".pcm"}
+
+_worker_model = None
+
+
+def _init_worker(model_path):
+    global _worker_model
+    # The parent's log listener thread does not exist in a forked worker
+    setup_logging()
+    _worker_model = load_model(model_path)
+
+
+def _open_file_source(path, samplerate=16000):
+    """Return (source, process) for a recording; other formats go through ffmpeg"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".wav":
+        return WavFileSource(path), None
+    if extension in RAW_EXTENSIONS:
+        return StreamSource(open(path, "rb", buffering=0), samplerate), None
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError(f"{path}: ffmpeg is needed to decode {extension} files")
+    process = subprocess.Popen(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", path,
+         "-ar", str(samplerate), "-ac", "1", "-f", "s16le", "-"],
+        stdout=subprocess.PIPE)
+    return StreamSource(process.stdout, samplerate), process
+
+
+def _decode_file(path, output_base):
+    """Worker: transcribe one file and write its .txt and .json outputs"""
+    started = time.perf_counter()
+    source, process = _open_file_source(path)
+    lines = []
+    records = []
+
+    def on_result(result):
+        lines.append(normalize_segment(result.text))
+        records.append(result.to_dict())
+
+    try:
+        transcribe(source, _worker_model, on_result)
+    finally:
+        if process is not None:
+            process.wait()
+    if process is not None and process.returncode != 0:
+        raise RuntimeError(f"{path}: ffmpeg exited with {process.returncode}")
+
+    os.makedirs(os.path.dirname(output_base), exist_ok=True)
+    # Write to temporary names first so a crash never leaves half a transcript
+    for extension, content in ((".txt", "\n".join(lines) + "\n"),
+                               (".json", json.dumps(records, ensure_ascii=False))):
+        with open(output_base + extension + ".tmp", "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(output_base + extension + ".tmp", output_base + extension)
+    return source.samples_read / source.samplerate, time.perf_counter() - started
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """SQLite record of finished files, keyed by content hash"""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                hash TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                status TEXT NOT NULL,
+                audio_seconds REAL,
+                decode_seconds REAL,
+                error TEXT,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                hash TEXT NOT NULL
+            );
+        """)
+
+    def cached_hash(self, path, size, mtime):
+        row = self.connection.execute(
+            "SELECT hash FROM files WHERE path = ? AND size = ? AND mtime = ?",
+            (path, size, mtime)).fetchone()
+        return row[0] if row else None
+
+    def remember_hash(self, path, size, mtime, digest):
+        self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                (path, size, mtime, digest))
+        self.connection.commit()
+
+    def is_done(self, digest):
+        row = self.connection.execute("SELECT status FROM jobs WHERE hash = ?", (digest,)).fetchone()
+        return row is not None and row[0] == "done"
+
+    def record(self, digest, path, status, audio_seconds=None, decode_seconds=None, error=None):
+        self.connection.execute("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (digest, path, status, audio_seconds, decode_seconds, error, time.time()))
+        self.connection.commit()
+
+
+class BatchRunner:
+    def __init__(self, input_dir, output_dir=None, model_path=MODEL_PATH, workers=None,
+                 interval=10.0, manifest_path=None):
+        self.input_dir = os.path.abspath(input_dir)
+        self.output_dir = os.path.abspath(output_dir or os.path.join(input_dir, "transcripts"))
+        self.model_path = model_path
+        self.workers = workers or os.cpu_count() or 1
+        self.interval = interval
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.manifest = Manifest(manifest_path or os.path.join(self.output_dir, "manifest.sqlite"))
+        self._sizes = {}  # path -> size at the previous scan, to skip files still being copied
+        self._queued = set()
+        self.audio_seconds = 0.0
+        self.files_done = 0
+
+    def scan(self):
+        """Return (path, hash) for stable files that are not done yet"""
+        ready = []
+        for root, dirs, files in os.walk(self.input_dir):
+            # Don't descend into our own output folder
+            dirs[:] = [d for d in dirs if os.path.join(root, d) != self.output_dir]
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() not in AUDIO_EXTENSIONS:
+                    continue
+                path = os.path.join(root, name)
+                if path in self._queued:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if self._sizes.get(path) != stat.st_size:
+                    self._sizes[path] = stat.st_size
+                    continue
+                digest = self.manifest.cached_hash(path, stat.st_size, stat.st_mtime)
+                if digest is None:
+                    digest = file_hash(path)
+                    self.manifest.remember_hash(path, stat.st_size, stat.st_mtime, digest)
+                if not self.manifest.is_done(digest):
+                    ready.append((path, digest))
+        return ready
+
+    def _output_base(self, path):
+        # Keep the source extension so a.wav and a.mp3 don't overwrite each other
+        relative = os.path.relpath(path, self.input_dir)
+        return os.path.join(self.output_dir, relative)
+
+    def run(self, once=False):
+        # Validate the model here so workers don't each exit on a bad path
+        if not os.path.exists(self.model_path):
+            load_model(self.model_path)
+        started = time.perf_counter()
+        running = {}
+        seen_hashes = set()
+
+        def submit(ready):
+            for path, digest in ready:
+                if digest in seen_hashes:
+                    continue  # Same content queued under another name
+                seen_hashes.add(digest)
+                self._queued.add(path)
+                future = pool.submit(_decode_file, path, self._output_base(path))
+                running[future] = (path, digest)
+
+        last_scan = None
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.model_path,)) as pool:
+            if once:
+                # Scan the backlog once up front; two passes are needed to see
+                # a file's size settle, then the loop only drains the pool
+                submit(self.scan() + self.scan())
+            while True:
+                if not once and (last_scan is None or time.monotonic() - last_scan >= self.interval):
+                    last_scan = time.monotonic()
+                    submit(self.scan())
+                if once and not running:
+                    break
+                if not running:
+                    time.sleep(self.interval)
+                    continue
+                done, _ = wait(running, timeout=self.interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, digest = running.pop(future)
+                    try:
+                        audio_seconds, decode_seconds = future.result()
+                    except Exception as e:
+                        logger.error("Error transcribing %s: %s", path, e)
+                        self.manifest.record(digest, path, "failed", error=str(e))
+                        continue
+                    self.manifest.record(digest, path, "done", audio_seconds, decode_seconds)
+                    self.audio_seconds += audio_seconds
+                    self.files_done += 1
+                    self.report(path, time.perf_counter() - started)
+        return self.audio_seconds, time.perf_counter() - started
+
+    def report(self, path, elapsed):
+        # Audio hours decoded per wall-clock hour
+        throughput = self.audio_seconds / elapsed if elapsed > 0 else 0.0
+        logger.info("[%d] %s: %.2f audio hours in %.2f h (%.1f audio h/h)",
+                    self.files_done, os.path.relpath(path, self.input_dir),
+                    self.audio_seconds / 3600, elapsed / 3600, throughput)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe a folder of recordings unattended")
+    parser.add_argument("input_dir", help="folder to watch for recordings")
+    parser.add_argument("--output", default=None, help="transcript folder (default: INPUT_DIR/transcripts)")
+    parser.add_argument("--model", default=MODEL_PATH, help="path to the Vosk model folder")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, one model each")
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between folder scans")
+    parser.add_argument("--manifest", default=None, help="SQLite manifest (default: OUTPUT/manifest.sqlite)")
+    parser.add_argument("--once", action="store_true", help="process the current backlog and exit")
+    args = parser.parse_args()
+
+    setup_logging()
+    runner = BatchRunner(args.input_dir, args.output, args.model, args.workers,
+                         args.interval, args.manifest)
+    try:
+        audio_seconds, elapsed = runner.run(once=args.once)
+    except KeyboardInterrupt:
+        logger.info("Stopped; finished files are recorded and will be skipped next time")
+        return
+    throughput = audio_seconds / elapsed if elapsed > 0 else 0.0
+    logger.info("Done: %d files, %.2f audio hours in %.2f h (%.1f audio h/h)",
+                runner.files_done, audio_seconds / 3600, elapsed / 3600, throughput)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Compare endpointing profiles on end-of-speech-to-final latency and WER.
+
+Each recording is streamed block by block as the GUI would, followed by
+two seconds of silence. Ends of speech are found from the signal energy;
+latency is the audio time between an end of speech and the next final
+result, so it does not depend on how fast this machine decodes.
+
+Run from the repository root:
+    python -m benchmarks.endpointing_benchmark [recording.wav reference.txt ...]
+"""
+import json
+import os
+import sys
+import wave
+
+import numpy as np
+from vosk import KaldiRecognizer
+
+from audio import PROFILES, AudioPreprocessor, SilenceDetector, apply_endpointing
+from transcriber import load_model
+from transcript import normalize_segment
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "models", "vosk-model-small-fa-0.42", "test")
+MODEL_PATH = os.path.dirname(TEST_DIR)
+BLOCK_SIZE = 4000
+
+
+def read_wav(path):
+    with wave.open(path, "rb") as wf:
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16), wf.getframerate()
+
+
+def speech_ends(audio, samplerate, threshold=0.01, min_gap=0.3):
+    """Return the times where speech stops for at least min_gap seconds"""
+    frame = samplerate // 100
+    frames = audio[:audio.size - audio.size % frame].reshape(-1, frame).astype(np.float32) / 32768.0
+    voiced = np.sqrt(np.mean(frames ** 2, axis=1)) > threshold
+    ends = []
+    last_voiced = None
+    for i, is_voiced in enumerate(voiced):
+        if is_voiced:
+            last_voiced = i
+        elif last_voiced is not None and (i - last_voiced) * 0.01 >= min_gap:
+            ends.append((last_voiced + 1) * 0.01)
+            last_voiced = None
+    if last_voiced is not None:
+        ends.append((last_voiced + 1) * 0.01)
+    return ends
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance"""
+    ref, hyp = reference.split(), hypothesis.split()
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1]
+
+
+def run_profile(model, profile, audio, samplerate):
+    rec = KaldiRecognizer(model, samplerate)
+    apply_endpointing(rec, profile)
+    preprocessor = AudioPreprocessor(samplerate=samplerate)
+    silence_detector = SilenceDetector(profile, samplerate)
+    padded = np.concatenate([audio, np.zeros(2 * samplerate, dtype=np.int16)])
+
+    finals = []  # (stream time of the final, text)
+    pending = []
+    finalize = False
+    for start in range(0, padded.size, BLOCK_SIZE):
+        block = padded[start:start + BLOCK_SIZE].tobytes()
+        # The detector sees the raw block, as in main.py
+        finalize = silence_detector.update(block) or finalize
+        pending.append(preprocessor.process(block))
+        if len(pending) < profile.decode_blocks:
+            continue
+        data = b"".join(pending)
+        pending = []
+        if rec.AcceptWaveform(data):
+            result = rec.Result()
+            silence_detector.reset()
+        elif finalize:
+            result = rec.FinalResult()
+        else:
+            continue
+        finalize = False
+        finals.append((min(start + BLOCK_SIZE, padded.size) / samplerate, json.loads(result).get("text", "")))
+    if pending:
+        rec.AcceptWaveform(b"".join(pending))
+    finals.append((padded.size / samplerate, json.loads(rec.FinalResult()).get("text", "")))
+    return finals
+
+
+def main(pairs):
+    model = load_model(MODEL_PATH)
+    recordings = []
+    for wav_path, text_path in pairs:
+        audio, samplerate = read_wav(wav_path)
+        with open(text_path, encoding="utf-8") as f:
+            reference = normalize_segment(f.read().strip())
+        recordings.append((audio, samplerate, reference, speech_ends(audio, samplerate)))
+
+    print("profile     mean latency(s)  max latency(s)    WER")
+    for name, profile in PROFILES.items():
+        latencies = []
+        errors = words = 0
+        for audio, samplerate, reference, ends in recordings:
+            finals = run_profile(model, profile, audio, samplerate)
+            for end in ends:
+                later = [t for t, text in finals if t >= end and text]
+                if later:
+                    latencies.append(later[0] - end)
+            hypothesis = normalize_segment(" ".join(text for _, text in finals if text))
+            errors += word_errors(reference, hypothesis)
+            words += len(reference.split())
+        mean = sum(latencies) / len(latencies) if latencies else float("nan")
+        worst = max(latencies) if latencies else float("nan")
+        print(f"{name:10s}  {mean:15.2f}  {worst:14.2f}  {errors / max(words, 1):6.1%}")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if args:
+        main(list(zip(args[::2], args[1::2])))
+    else:
+        main([(os.path.join(TEST_DIR, "test.wav"), os.path.join(TEST_DIR, "test.txt"))])
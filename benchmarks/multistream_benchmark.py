@@ -0,0 +1,51 @@
+"""Find how many streams one machine can decode at real time.
+
+Each stream replays the model's test recording unpaced through
+MultiDeviceTranscriber; a stream count is sustainable when the batch
+finishes faster than the audio lasts.
+
+Run from the repository root:  python -m benchmarks.multistream_benchmark [max_streams]
+"""
+import os
+import sys
+import time
+import wave
+
+from audio import MultiDeviceTranscriber, WavFileSource
+from transcriber import load_model
+
+TEST_WAV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "models", "vosk-model-small-fa-0.42", "test", "test.wav")
+MODEL_PATH = os.path.dirname(os.path.dirname(TEST_WAV))
+
+
+def run(model, streams):
+    sources = [(f"stream{i}", WavFileSource(TEST_WAV)) for i in range(streams)]
+    transcriber = MultiDeviceTranscriber(model, sources)
+    start = time.perf_counter()
+    transcriber.start()
+    transcriber.wait()
+    return time.perf_counter() - start
+
+
+def main(max_streams=None):
+    max_streams = max_streams or 2 * (os.cpu_count() or 1)
+    with wave.open(TEST_WAV, "rb") as wf:
+        audio_seconds = wf.getnframes() / wf.getframerate()
+    model = load_model(MODEL_PATH)
+
+    print(f"{os.cpu_count()} CPUs, {audio_seconds:.1f}s of audio per stream")
+    print("streams  wall(s)  real-time factor  sustainable")
+    streams = 1
+    while streams <= max_streams:
+        elapsed = run(model, streams)
+        # Real-time factor of the slowest stream: wall time over audio time
+        rtf = elapsed / audio_seconds
+        print(f"{streams:7d}  {elapsed:7.2f}  {rtf:16.3f}  {'yes' if rtf < 1.0 else 'no'}")
+        if rtf >= 1.0:
+            break
+        streams *= 2
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
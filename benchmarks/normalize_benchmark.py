@@ -0,0 +1,26 @@
+"""Measure the cost of the Persian post-processor per final segment.
+
+Run from the repository root:  python -m benchmarks.normalize_benchmark
+"""
+import timeit
+
+from transcript.normalize import normalize_segment
+
+SEGMENTS = [
+    "من عرضه اين کارو ندارم",
+    "من می خواهم دو هزار و سیصد و بیست و پنج تومان بدهم",
+    "کتاب ها را نمی دانم کجا گذاشتم",
+    "جلسه ساعت ده و نیم با سی و دو نفر برگزار می شود",
+    "بزرگ ترین شهر ايران تهران است",
+]
+
+
+def main(repeat=5, number=20000):
+    for segment in SEGMENTS:
+        timer = timeit.Timer(lambda: normalize_segment(segment))
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+        print(f"{best * 1e6:7.2f} us/segment  {len(segment):3d} chars  {normalize_segment(segment)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Render cost of the overlay during a fast stream of partial results.
+
+Compares the previous QLabel with a drop shadow effect and stylesheet
+against OverlayLabel. Each update sets the text and processes events so
+the resulting paint is included. Runs offscreen when there is no display.
+
+Run from the repository root:  python -m benchmarks.overlay_benchmark [updates]
+"""
+import os
+import sys
+import time
+
+if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication, QGraphicsDropShadowEffect, QLabel, QWidget
+
+from gui.overlay_label import OverlayLabel
+
+WORDS = "من می‌خواهم امروز درباره برنامه جلسه هفته آینده با شما صحبت کنم".split()
+
+
+def make_window(label_factory):
+    window = QWidget()
+    window.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool)
+    window.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+    window.resize(600, 60)
+    label = label_factory(window)
+    label.setGeometry(0, 0, 600, 60)
+    font = QFont("Arial")
+    font.setPointSize(14)
+    label.setFont(font)
+    window.show()
+    return window, label
+
+
+def legacy_label(parent):
+    # The overlay as it was built before OverlayLabel
+    label = QLabel(parent)
+    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    shadow = QGraphicsDropShadowEffect()
+    shadow.setBlurRadius(15)
+    shadow.setColor(Qt.GlobalColor.black)
+    shadow.setOffset(0, 0)
+    label.setGraphicsEffect(shadow)
+    label.setStyleSheet("""
+        QLabel {
+            color: white;
+            background-color: rgba(40, 40, 40, 80);
+            padding: 8px 15px;
+            border-radius: 10px;
+            border: 1px solid rgba(255, 255, 255, 20);
+        }
+    """)
+    return label
+
+
+def partial_stream(updates):
+    # Partials grow word by word and are occasionally rewritten
+    text = []
+    for i in range(updates):
+        if i % 7 == 6 and text:
+            text[-1] = WORDS[(i * 3) % len(WORDS)]
+        else:
+            text.append(WORDS[i % len(WORDS)])
+        yield " ".join(text)
+
+
+def measure(app, label_factory, updates):
+    window, label = make_window(label_factory)
+    app.processEvents()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    for text in partial_stream(updates):
+        label.setText(text)
+        app.processEvents()
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    window.close()
+    return wall / updates, cpu / updates
+
+
+def main(updates=500):
+    app = QApplication(sys.argv[:1])
+    print(f"{updates} partial updates on platform '{app.platformName()}'")
+    print("widget         ms/update  CPU ms/update")
+    for name, factory in (("QLabel+shadow", legacy_label), ("OverlayLabel", OverlayLabel)):
+        wall, cpu = measure(app, factory, updates)
+        print(f"{name:13s}  {wall * 1000:9.3f}  {cpu * 1000:13.3f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -1,4 +1,6 @@
+from .history_window import HistoryWindow
+from .overlay_label import OverlayLabel
 from .settings_window import SettingsWindow
 from .transcription_window import TranscriptionWindow
 
-__all__ = ['SettingsWindow', 'TranscriptionWindow']
\ No newline at end of file
+__all__ = ['HistoryWindow', 'OverlayLabel', 'SettingsWindow', 'TranscriptionWindow']
\ No newline at end of file
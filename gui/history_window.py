@@ -0,0 +1,135 @@
+import logging
+from datetime import datetime
+
+import pyperclip
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QGraphicsDropShadowEffect, QVBoxLayout, QHBoxLayout,
+    QLineEdit, QListWidget, QListWidgetItem, QPushButton, QLabel
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWindow(QWidget):
+    def __init__(self, history_store, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.history_store = history_store
+        self.setWindowModality(Qt.WindowModality.NonModal)
+        self.init_ui()
+
+        # Debounce searches while typing
+        self.search_timer = QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.refresh_results)
+
+    def init_ui(self):
+        # Common styles, matching the settings window
+        BACKGROUND_COLOR = "rgba(40, 40, 40, 200)"
+        ELEMENT_BACKGROUND = "rgba(60, 60, 60, 180)"
+        BORDER_COLOR = "rgba(255, 255, 255, 20)"
+        TEXT_COLOR = "white"
+
+        self.setWindowFlags(
+            Qt.WindowType.Window |
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.container = QWidget()
+        self.container.setStyleSheet(f"""
+            QWidget {{
+                background-color: {BACKGROUND_COLOR};
+                border-radius: 10px;
+                border: 1px solid {BORDER_COLOR};
+            }}
+        """)
+        container_layout = QVBoxLayout(self.container)
+        container_layout.setContentsMargins(15, 15, 15, 15)
+
+        search_label = QLabel("Search History:")
+        search_label.setStyleSheet(f"color: {TEXT_COLOR};")
+
+        element_style = f"""
+            color: {TEXT_COLOR};
+            background-color: {ELEMENT_BACKGROUND};
+            padding: 8px;
+            border-radius: 5px;
+            border: 1px solid {BORDER_COLOR};
+        """
+        self.search_box = QLineEdit()
+        self.search_box.setStyleSheet(f"QLineEdit {{{element_style}}}")
+        self.search_box.textChanged.connect(lambda _: self.search_timer.start(150))
+
+        self.results_list = QListWidget()
+        self.results_list.setWordWrap(True)
+        self.results_list.setStyleSheet(f"QListWidget {{{element_style}}}")
+        # Double click copies an entry back to the clipboard
+        self.results_list.itemDoubleClicked.connect(self.copy_item)
+
+        button_layout = QHBoxLayout()
+        close_button = QPushButton("Close")
+        close_button.setStyleSheet(f"""
+            QPushButton {{
+                {element_style}
+                padding: 8px 15px;
+            }}
+            QPushButton:hover {{
+                background-color: rgba(80, 80, 80, 180);
+            }}
+        """)
+        close_button.clicked.connect(self.close)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+
+        container_layout.addWidget(search_label)
+        container_layout.addWidget(self.search_box)
+        container_layout.addWidget(self.results_list)
+        container_layout.addLayout(button_layout)
+        main_layout.addWidget(self.container)
+
+        shadow = QGraphicsDropShadowEffect()
+        shadow.setBlurRadius(15)
+        shadow.setColor(Qt.GlobalColor.black)
+        shadow.setOffset(0, 0)
+        self.container.setGraphicsEffect(shadow)
+
+        self.resize(450, 400)
+        self.center_on_screen()
+
+    def center_on_screen(self):
+        screen = QApplication.primaryScreen().geometry()
+        self.move(
+            (screen.width() - self.width()) // 2,
+            (screen.height() - self.height()) // 2
+        )
+
+    def refresh_results(self):
+        self.results_list.clear()
+        for entry in self.history_store.search(self.search_box.text()):
+            when = datetime.fromtimestamp(entry["timestamp"]).strftime("%Y-%m-%d %H:%M")
+            item = QListWidgetItem(f"{when}  {entry['text']}")
+            item.setData(Qt.ItemDataRole.UserRole, entry["text"])
+            self.results_list.addItem(item)
+
+    def copy_item(self, item):
+        try:
+            pyperclip.copy(item.data(Qt.ItemDataRole.UserRole))
+        except Exception as e:
+            logger.error("Error copying to clipboard: %s", e)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_results()
+        self.search_box.setFocus()
+
+    def closeEvent(self, event):
+        # Hide instead of close
+        event.ignore()
+        self.hide()
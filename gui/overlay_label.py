@@ -0,0 +1,113 @@
+from PyQt6.QtCore import Qt, QRectF, QPointF
+from PyQt6.QtGui import QColor, QFontMetricsF, QPainter, QPainterPath, QPen, QPixmap, QStaticText, QTextOption
+from PyQt6.QtWidgets import QWidget
+
+
+class OverlayLabel(QWidget):
+    """Single-line overlay text on a cached translucent background.
+
+    The rounded background, border and soft shadow are painted once per
+    size into a pixmap. ``setText`` only re-lays out the text, elides long
+    text from the start so the newest words stay visible, and schedules a
+    repaint of the text rectangle; it never triggers a relayout or a
+    graphics effect pass.
+    """
+
+    SHADOW = 6      # Pixels around the panel reserved for the shadow
+    RADIUS = 10
+    PADDING_X = 15
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._text = ""
+        self._static_text = QStaticText()
+        self._static_text.setTextFormat(Qt.TextFormat.PlainText)
+        self._static_text.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapMode.NoWrap)
+        self._static_text.setTextOption(option)
+        self._background = None
+        self._metrics = QFontMetricsF(self.font())
+        self.text_color = QColor("white")
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        if text == self._text:
+            return
+        self._text = text
+        self._update_static_text()
+        self.update(self._text_rect().toAlignedRect())
+
+    def setFont(self, font):
+        super().setFont(font)
+        self._metrics = QFontMetricsF(font)
+        self._update_static_text()
+        self.update()
+
+    def _panel_rect(self):
+        return QRectF(self.rect()).adjusted(self.SHADOW, self.SHADOW, -self.SHADOW, -self.SHADOW)
+
+    def _text_rect(self):
+        return self._panel_rect().adjusted(self.PADDING_X, 1, -self.PADDING_X, -1)
+
+    def _update_static_text(self):
+        width = self._text_rect().width()
+        # Drop the oldest words rather than wrapping or resizing
+        self._static_text.setText(self._metrics.elidedText(self._text, Qt.TextElideMode.ElideLeft, width))
+        self._static_text.prepare(font=self.font())
+
+    def resizeEvent(self, event):
+        self._background = None
+        self._update_static_text()
+        super().resizeEvent(event)
+
+    def _render_background(self):
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        panel = self._panel_rect()
+
+        # Soft shadow from stacked, fading rounded rects
+        painter.setPen(Qt.PenStyle.NoPen)
+        for i in range(self.SHADOW, 0, -1):
+            painter.setBrush(QColor(0, 0, 0, int(60 / self.SHADOW)))
+            painter.drawRoundedRect(panel.adjusted(-i, -i, i, i), self.RADIUS + i, self.RADIUS + i)
+
+        # Clear under the panel so the shadow doesn't darken its translucency
+        path = QPainterPath()
+        path.addRoundedRect(panel, self.RADIUS, self.RADIUS)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Clear)
+        painter.fillPath(path, Qt.GlobalColor.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        painter.fillPath(path, QColor(40, 40, 40, 80))
+        painter.setPen(QPen(QColor(255, 255, 255, 20), 1))
+        painter.drawPath(path)
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        if self._background is None:
+            self._background = self._render_background()
+        painter = QPainter(self)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        # Only the exposed part of the cached background is copied
+        exposed = QRectF(event.rect())
+        ratio = self._background.devicePixelRatio()
+        source = QRectF(exposed.topLeft() * ratio, exposed.size() * ratio)
+        painter.drawPixmap(exposed, self._background, source)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+
+        if self._static_text.text():
+            rect = self._text_rect()
+            size = self._static_text.size()
+            position = QPointF(rect.x() + (rect.width() - size.width()) / 2,
+                               rect.y() + (rect.height() - size.height()) / 2)
+            painter.setPen(self.text_color)
+            painter.setFont(self.font())
+            painter.drawStaticText(position, self._static_text)
+        painter.end()
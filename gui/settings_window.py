@@ -1,10 +1,10 @@
-import sounddevice as sd
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QKeyEvent
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QGraphicsDropShadowEffect, QVBoxLayout, QComboBox, 
     QHBoxLayout, QPushButton, QLabel, QFrame
 )
+from audio import PROFILES, DEFAULT_PROFILE
 
 class SettingsWindow(QWidget):
     def __init__(self, parent=None):
@@ -112,6 +112,30 @@ class SettingsWindow(QWidget):
         hotkey_layout.addWidget(self.hotkey_display)
         hotkey_layout.addWidget(self.hotkey_button)
 
+        # Toggle on each press, or record only while the hotkey is held
+        self.hotkey_mode_combo = QComboBox()
+        self.hotkey_mode_combo.setStyleSheet(self.device_combo.styleSheet())
+        self.hotkey_mode_combo.addItem("Press to start/stop", "toggle")
+        self.hotkey_mode_combo.addItem("Hold to talk", "hold")
+
+        # Endpointing section
+        endpoint_label = QLabel("Endpointing:")
+        endpoint_label.setStyleSheet(f"color: white;")
+        self.endpoint_combo = QComboBox()
+        self.endpoint_combo.setStyleSheet(self.device_combo.styleSheet())
+        for name in PROFILES:
+            self.endpoint_combo.addItem(name.capitalize(), name)
+        self.select_endpoint_profile(DEFAULT_PROFILE)
+
+        # Output section
+        output_label = QLabel("Output:")
+        output_label.setStyleSheet(f"color: white;")
+        self.output_combo = QComboBox()
+        self.output_combo.setStyleSheet(self.device_combo.styleSheet())
+        self.output_combo.addItem("Copy to clipboard", "clipboard")
+        self.output_combo.addItem("Type into focused window", "type")
+        self.output_combo.addItem("Type with live partials", "type_partials")
+
         # Button layout
         button_layout = QHBoxLayout()
         apply_button = QPushButton("Apply")
@@ -146,6 +170,13 @@ class SettingsWindow(QWidget):
         container_layout.addSpacing(10)
         container_layout.addWidget(hotkey_label)
         container_layout.addLayout(hotkey_layout)
+        container_layout.addWidget(self.hotkey_mode_combo)
+        container_layout.addSpacing(10)
+        container_layout.addWidget(endpoint_label)
+        container_layout.addWidget(self.endpoint_combo)
+        container_layout.addSpacing(10)
+        container_layout.addWidget(output_label)
+        container_layout.addWidget(self.output_combo)
         container_layout.addSpacing(10)
         container_layout.addLayout(button_layout)
         
@@ -160,7 +191,7 @@ class SettingsWindow(QWidget):
         self.container.setGraphicsEffect(shadow)
         
         # Set window size
-        self.resize(300, 200)
+        self.resize(300, 360)
         self.center_on_screen()
 
     def center_on_screen(self):
@@ -171,6 +202,8 @@ class SettingsWindow(QWidget):
         )
 
     def populate_devices(self):
+        # Imported here so the gui package loads without PortAudio (e.g. benchmarks)
+        import sounddevice as sd
         self.device_combo.clear()
         devices = sd.query_devices()
         for i, device in enumerate(devices):
@@ -183,6 +216,21 @@ class SettingsWindow(QWidget):
             if index >= 0:
                 self.device_combo.setCurrentIndex(index)
 
+    def select_endpoint_profile(self, name):
+        index = self.endpoint_combo.findData(name)
+        if index >= 0:
+            self.endpoint_combo.setCurrentIndex(index)
+
+    def select_hotkey_mode(self, mode):
+        index = self.hotkey_mode_combo.findData(mode)
+        if index >= 0:
+            self.hotkey_mode_combo.setCurrentIndex(index)
+
+    def select_output_mode(self, mode):
+        index = self.output_combo.findData(mode)
+        if index >= 0:
+            self.output_combo.setCurrentIndex(index)
+
     def start_listening_for_hotkey(self):
         if self.is_listening_for_hotkey:
             self.stop_listening_for_hotkey()
@@ -261,6 +309,11 @@ class SettingsWindow(QWidget):
                 # Update the TranscriptionState directly
                 if self.transcription_state:
                     self.transcription_state.update_hotkey(self.current_hotkey)
+        # Takes effect from the next recording
+        if self.transcription_state:
+            self.transcription_state.endpoint_profile = self.endpoint_combo.currentData()
+            self.transcription_state.output_mode = self.output_combo.currentData()
+            self.transcription_state.update_hotkey_mode(self.hotkey_mode_combo.currentData())
         self.hide()  # Hide instead of close
 
     def closeEvent(self, event):
@@ -1,3 +1,4 @@
+import logging
 import sys
 import time
 import queue
@@ -8,8 +9,13 @@ from PyQt6.QtWidgets import (
     QApplication, QLabel, QWidget, QSystemTrayIcon, QMenu, QGraphicsDropShadowEffect, QVBoxLayout, QComboBox, QHBoxLayout, QPushButton
 )
 import pyperclip
+from profiler import SamplingProfiler
+from .history_window import HistoryWindow
+from .overlay_label import OverlayLabel
 from .settings_window import SettingsWindow
 
+logger = logging.getLogger(__name__)
+
 class TranscriptionWindow(QWidget):
     def __init__(self, transcription_queue, control_event, font_family="Arial"):
         super().__init__()
@@ -24,6 +30,11 @@ class TranscriptionWindow(QWidget):
         self.settings_window = None
         # Add transcription_state property
         self.transcription_state = None  # Will be set by main.py
+        # Transcription history store and its search window
+        self.history_store = None  # Will be set by main.py
+        self.history_window = None
+        # Sampling profiler, created on first use so it costs nothing until enabled
+        self.profiler = None
         self.init_ui()
         self.init_tray()
         
@@ -45,41 +56,8 @@ class TranscriptionWindow(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
         
-        # Create label for transcription text
-        self.label = QLabel(self)
-        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Remove the blur effect and just keep the shadow
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(15)
-        shadow.setColor(Qt.GlobalColor.black)
-        shadow.setOffset(0, 0)
-        self.label.setGraphicsEffect(shadow)
-        
-        # Update stylesheet for frosted glass effect
-        self.setStyleSheet("""
-            QWidget {
-                border-radius: 10px;
-                background-color: transparent;
-            }
-        """)
-        
-        # Updated label stylesheet with better blur simulation
-        self.label.setStyleSheet(f"""
-            QLabel {{
-                color: white;
-                background-color: rgba(40, 40, 40, 80);
-                padding: 8px 15px;
-                border-radius: 10px;
-                width: 100%;
-                height: 100%;
-                text-align: center;
-                qproperty-alignment: AlignCenter;
-                font-family: {self.font_family};
-                font-size: 14px;
-                border: 1px solid rgba(255, 255, 255, 20);
-            }}
-        """)
+        # Custom-painted label: cached background and shadow, repaints only the text
+        self.label = OverlayLabel(self)
         
         # Set locale for Persian text
         locale = QLocale(QLocale.Language.Persian)
@@ -117,6 +95,12 @@ class TranscriptionWindow(QWidget):
         tray_menu = QMenu()
         settings_action = tray_menu.addAction("Settings")
         settings_action.triggered.connect(self.show_settings)
+        history_action = tray_menu.addAction("Search History")
+        history_action.triggered.connect(self.show_history)
+        self.profiling_action = tray_menu.addAction("Start Profiling")
+        self.profiling_action.triggered.connect(self.toggle_profiling)
+        # The profiler stops itself after a time limit, so refresh the label on open
+        tray_menu.aboutToShow.connect(self.update_profiling_action)
         tray_menu.addSeparator()
         quit_action = tray_menu.addAction("Quit")
         quit_action.triggered.connect(self.quit_app)
@@ -143,10 +127,33 @@ class TranscriptionWindow(QWidget):
         # Set the selected device if it exists
         self.settings_window.selected_device = self.selected_device
         self.settings_window.populate_devices()  # Repopulate with current selection
+        if self.transcription_state is not None:
+            self.settings_window.select_endpoint_profile(self.transcription_state.endpoint_profile)
+            self.settings_window.select_output_mode(self.transcription_state.output_mode)
+            self.settings_window.select_hotkey_mode(self.transcription_state.hotkey_mode)
         self.settings_window.show()
         self.settings_window.raise_()
         self.settings_window.activateWindow()
 
+    def show_history(self):
+        if self.history_store is None:
+            return
+        if not self.history_window:
+            self.history_window = HistoryWindow(self.history_store, self)
+        self.history_window.show()
+        self.history_window.raise_()
+        self.history_window.activateWindow()
+
+    def toggle_profiling(self):
+        if self.profiler is None:
+            self.profiler = SamplingProfiler()
+        self.profiler.toggle()
+        self.update_profiling_action()
+
+    def update_profiling_action(self):
+        running = self.profiler is not None and self.profiler.is_running
+        self.profiling_action.setText("Stop Profiling" if running else "Start Profiling")
+
     def set_recording_state(self, is_recording):
         """Update tray icon based on recording state"""
         icon_path = self.icon_recording if is_recording else self.icon_default
@@ -165,6 +172,15 @@ class TranscriptionWindow(QWidget):
     def quit_app(self):
         # Hide tray icon before quitting
         self.tray_icon.hide()
+        # Flush pending history entries to disk
+        if self.history_store is not None:
+            self.history_store.stop()
+        # Remove the session's spilled transcript
+        if self.transcription_state is not None:
+            self.transcription_state.full_result.close()
+        # Write out an active profiling session
+        if self.profiler is not None and self.profiler.is_running:
+            self.profiler.stop(wait=True)
         # Signal the recording thread to stop
         self.control_event.set()
         # Give the thread a moment to clean up
@@ -208,9 +224,9 @@ class TranscriptionWindow(QWidget):
                     # Copy text to clipboard in GUI thread
                     try:
                         pyperclip.copy(message)
-                        print("Transcription copied to clipboard!")
+                        logger.info("Transcription copied to clipboard")
                     except Exception as e:
-                        print("Error copying to clipboard:", str(e))
+                        logger.error("Error copying to clipboard: %s", e)
                 elif action == "exit":
                     self.close()
                     QApplication.quit()
@@ -0,0 +1,136 @@
+from pynput import keyboard
+from pynput.keyboard import Key
+
+# One bit per logical modifier, as used in combinations
+CTRL, SHIFT, ALT, CMD = 1, 2, 4, 8
+
+# Each physical key (left, right, generic) gets its own bit so releasing
+# one side doesn't clear a modifier still held on the other; the logical
+# mask is the OR of each group
+_MODIFIER_BITS = {}  # Key -> (physical bit, logical bit)
+_GROUP_MASKS = []    # (logical bit, physical bits of its keys)
+for _bit, _names in ((CTRL, ("ctrl", "ctrl_l", "ctrl_r")),
+                     (SHIFT, ("shift", "shift_l", "shift_r")),
+                     (ALT, ("alt", "alt_l", "alt_r", "alt_gr")),
+                     (CMD, ("cmd", "cmd_l", "cmd_r"))):
+    _group = 0
+    for _name in _names:
+        _key = getattr(Key, _name, None)
+        if _key is not None and _key not in _MODIFIER_BITS:
+            _physical = 1 << len(_MODIFIER_BITS)
+            _MODIFIER_BITS[_key] = (_physical, _bit)
+            _group |= _physical
+    _GROUP_MASKS.append((_bit, _group))
+
+
+def _logical_mask(pressed):
+    mask = 0
+    for bit, group in _GROUP_MASKS:
+        if pressed & group:
+            mask |= bit
+    return mask
+
+
+# Names used in hotkey combinations, as produced by the settings window
+_NAME_BITS = {"key.ctrl": CTRL, "key.shift": SHIFT, "key.alt": ALT, "key.cmd": CMD}
+
+
+class HotkeyEngine:
+    """Match a global hotkey with constant work and no allocation per event.
+
+    Modifier state is kept as bitmasks updated on press and release, and
+    the combination is compiled once into a target mask plus the trigger
+    key forms that may be reported for it. In ``toggle`` mode each press of
+    the hotkey alternates ``on_start`` and ``on_stop``; in ``hold`` mode
+    recording runs while the combination is held (push-to-talk). Callbacks
+    run on the pynput thread and should only hand work off.
+    """
+
+    def __init__(self, combination, on_start, on_stop, mode="toggle"):
+        self.on_start = on_start
+        self.on_stop = on_stop
+        self.mode = mode
+        self.pressed = 0  # Physical modifier keys down
+        self.mask = 0     # Logical modifiers down
+        self.active = False
+        self._trigger_down = False
+        self.listener = None
+        self.set_combination(combination)
+
+    def set_combination(self, combination):
+        """Compile a set of key names such as {'key.ctrl', 'key.shift', 's'}"""
+        target_mask = 0
+        trigger_chars = frozenset()
+        trigger_keys = frozenset()
+        for name in combination:
+            name = name.lower()
+            if name in _NAME_BITS:
+                target_mask |= _NAME_BITS[name]
+            elif name.startswith("key.") and hasattr(Key, name[4:]):
+                trigger_keys = frozenset((getattr(Key, name[4:]),))
+            elif len(name) == 1:
+                # With Ctrl held some platforms report a control character
+                # and with Shift held an upper case one
+                forms = {name, name.upper()}
+                if "a" <= name <= "z":
+                    forms.add(chr(ord(name) - 96))
+                trigger_chars = frozenset(forms)
+        self.target_mask = target_mask
+        self.trigger_chars = trigger_chars
+        self.trigger_keys = trigger_keys
+        self.modifiers_only = not trigger_chars and not trigger_keys
+
+    def _is_trigger(self, key):
+        if key in self.trigger_keys:
+            return True
+        char = getattr(key, "char", None)
+        return char is not None and char in self.trigger_chars
+
+    def on_press(self, key):
+        physical, bit = _MODIFIER_BITS.get(key, (0, 0))
+        if bit:
+            self.pressed |= physical
+            self.mask |= bit
+            if not (self.modifiers_only and self.mask == self.target_mask):
+                return
+        elif not self._is_trigger(key) or self.mask != self.target_mask:
+            return
+        # Ignore auto-repeat while the trigger is held
+        if self._trigger_down:
+            return
+        self._trigger_down = True
+        if self.mode == "hold":
+            if not self.active:
+                self.active = True
+                self.on_start()
+        else:
+            self.active = not self.active
+            (self.on_start if self.active else self.on_stop)()
+
+    def on_release(self, key):
+        physical, bit = _MODIFIER_BITS.get(key, (0, 0))
+        if bit:
+            self.pressed &= ~physical
+            self.mask = _logical_mask(self.pressed)
+            # Still held on the other side, or not part of the combination
+            if self.mask & bit or not (self.target_mask & bit):
+                return
+        elif not self._is_trigger(key):
+            return
+        self._trigger_down = False
+        if self.mode == "hold" and self.active:
+            self.active = False
+            self.on_stop()
+
+    def keys_held(self):
+        """True while any modifier is down"""
+        return self.mask != 0
+
+    def start(self):
+        self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
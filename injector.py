@@ -0,0 +1,153 @@
+import logging
+import queue
+import threading
+import time
+
+from pynput.keyboard import Controller, Key
+
+logger = logging.getLogger(__name__)
+
+
+class TextInjector:
+    """Type recognized text into the focused window from a worker thread.
+
+    ``commit`` types a final segment and ``partial`` shows the current
+    partial in place (only when ``replace_partials`` is set), rewriting just
+    the characters that changed. Updates arriving within ``flush_interval``
+    are coalesced, so a burst of partials costs one edit, and typing is
+    throttled to ``chars_per_second``. Nothing here blocks the caller.
+    """
+
+    def __init__(self, replace_partials=False, chars_per_second=300, flush_interval=0.05,
+                 keys_held=None):
+        self.replace_partials = replace_partials
+        self.chars_per_second = chars_per_second
+        self.flush_interval = flush_interval
+        # Returns True while the user still holds keys, e.g. the stop hotkey
+        self.keys_held = keys_held
+        self.controller = Controller()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._typed_partial = ""
+        self._need_space = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="injector", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            # Erase a partial that no final segment replaced
+            self.reset()
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def commit(self, text):
+        """Type a final segment"""
+        if text:
+            self._queue.put(("commit", text))
+
+    def partial(self, text):
+        """Show the current partial, replacing the previous one"""
+        if self.replace_partials:
+            self._queue.put(("partial", text))
+
+    def reset(self):
+        """Erase the typed partial and start over, e.g. for a new recording"""
+        self._queue.put(("reset", None))
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            # Let a burst of updates arrive, then apply them as one edit
+            time.sleep(self.flush_interval)
+            items = [item]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            running = items[-1] is not None
+            self._apply([i for i in items if i is not None])
+            if not running:
+                return
+
+    def _apply(self, items):
+        group = []
+        for item in items:
+            if item[0] == "reset":
+                self._apply_group(group)
+                self._erase_partial()
+                self._need_space = False
+                group = []
+            else:
+                group.append(item)
+        self._apply_group(group)
+
+    def _apply_group(self, items):
+        # Collapse to the text that should end up after the last commit
+        committed = ""
+        partial = None
+        for action, text in items:
+            if action == "commit":
+                committed += (" " if self._need_space or committed else "") + text
+                partial = None
+            else:
+                partial = text
+        need_space = self._need_space or bool(committed)
+        if committed:
+            target = committed
+            if partial:
+                target += " " + partial
+        elif partial:
+            target = (" " if self._need_space else "") + partial
+        else:
+            target = ""
+        if target == self._typed_partial and not committed:
+            return
+        try:
+            self._wait_for_release()
+            self._replace(self._typed_partial, target)
+        except Exception as e:
+            logger.error("Error typing transcription: %s", e)
+        # Committed text is final; only the trailing partial may be rewritten
+        self._typed_partial = target[len(committed):] if committed else target
+        self._need_space = need_space
+
+    def _erase_partial(self):
+        if self._typed_partial:
+            try:
+                self._wait_for_release()
+                self._replace(self._typed_partial, "")
+            except Exception as e:
+                logger.error("Error erasing partial transcription: %s", e)
+        self._typed_partial = ""
+
+    def _wait_for_release(self):
+        # Typing while Ctrl/Shift are down would send shortcuts instead of
+        # text, so hold the output back for as long as they stay down (in
+        # hold-to-talk mode that is until the hotkey is released)
+        while self.keys_held is not None and self.keys_held():
+            time.sleep(0.02)
+
+    def _replace(self, old, new):
+        # Keep the common prefix and rewrite only the rest
+        common = 0
+        for a, b in zip(old, new):
+            if a != b:
+                break
+            common += 1
+        for _ in range(len(old) - common):
+            self.controller.press(Key.backspace)
+            self.controller.release(Key.backspace)
+        self._type(new[common:])
+
+    def _type(self, text, chunk_size=20):
+        for start in range(0, len(text), chunk_size):
+            chunk = text[start:start + chunk_size]
+            self.controller.type(chunk)
+            time.sleep(len(chunk) / self.chars_per_second)
@@ -0,0 +1,113 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+FORMAT = '[%(levelname)s] %(threadName)s: %(message)s'
+
+_listener = None
+
+
+class RateLimitFilter(logging.Filter):
+    """Pass at most ``burst`` records per message template every ``interval`` seconds.
+
+    Repeated errors from the audio or decode loops are dropped on the
+    calling thread, and the next record let through says how many were
+    suppressed. Records below ``min_level`` (status and report lines)
+    always pass.
+    """
+
+    def __init__(self, interval=5.0, burst=3, min_level=logging.WARNING):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.min_level = min_level
+        self._windows = {}  # (logger, template) -> [window start, passed, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < self.min_level:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the listener thread without formatting or blocking.
+
+    Formatting is left to the listener, and when the queue is full the
+    record is dropped rather than stalling an audio or input thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def setup_logging(level=None, log_file=None, queue_size=10000):
+    """Route all logging through a queue to a background writer thread.
+
+    The level defaults to the PARSPEAK_LOG_LEVEL environment variable, or
+    INFO. Safe to call again, e.g. in a forked worker process.
+    """
+    global _listener
+    if level is None:
+        level = os.environ.get("PARSPEAK_LOG_LEVEL", "INFO").upper()
+
+    formatter = logging.Formatter(FORMAT)
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=1 << 20, backupCount=3, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if _listener is not None:
+        _listener.stop()
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records; registered to run at exit"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -3,88 +3,59 @@ import sys
 import time
 import queue
 import json
+import logging
 import threading
 from datetime import datetime
 
-import numpy as np
 import sounddevice as sd
-from vosk import Model, KaldiRecognizer
-from pynput import keyboard
+from vosk import KaldiRecognizer
 from PyQt6.QtGui import QFontDatabase
 from PyQt6.QtWidgets import (
     QApplication
 )
 
 from gui.transcription_window import TranscriptionWindow
+from transcriber import load_model
+from injector import TextInjector
+from hotkeys import HotkeyEngine
+from audio import AudioPreprocessor, MicrophoneSource, PROFILES, DEFAULT_PROFILE, SilenceDetector, apply_endpointing
+from transcript import HistoryStore, TranscriptLog, normalize_segment
+from logging_setup import setup_logging
 
+logger = logging.getLogger(__name__)
 
-# Keep existing queue and TranscriptionState class
-q = queue.Queue()
+
+# Keep existing TranscriptionState class
 MIN_RECORDING_DURATION = 0.5
 
 class TranscriptionState:
     def __init__(self):
-        self.full_result = []
+        # Bounded window of committed segments; older ones spill to disk
+        self.full_result = TranscriptLog()
         self.current_partial = ""
+        # Endpointing profile name, see audio.endpointing.PROFILES
+        self.endpoint_profile = DEFAULT_PROFILE
+        # "clipboard", "type" (type finals into the focused window) or "type_partials"
+        self.output_mode = "clipboard"
         # Use consistent key format
         self.hotkey_combination = {'key.ctrl', 'key.shift', 's'}
+        # "toggle" starts and stops on each press, "hold" records while held
+        self.hotkey_mode = "toggle"
+        self.hotkey_engine = None  # Set by record()
 
     def update_hotkey(self, new_combination):
         # Convert combination to lowercase set for consistent comparison
         self.hotkey_combination = {k.lower() for k in new_combination}
+        if self.hotkey_engine is not None:
+            self.hotkey_engine.set_combination(self.hotkey_combination)
 
-def normalize_key(key):
-    """Convert key to standardized string format"""
-    try:
-        # Handle special keys
-        if hasattr(key, 'char'):
-            if key.char == '\x03':
-                return 'key.ctrl'
-            return key.char.lower()
-        # Handle modifier and special keys
-        if hasattr(key, 'name'):
-            return f'key.{key.name.lower()}'  # Add 'key.' prefix for special keys
-        # Handle normal character keys
-        return str(key).lower()
-    except AttributeError:
-        return str(key).lower()
+    def update_hotkey_mode(self, mode):
+        self.hotkey_mode = mode
+        if self.hotkey_engine is not None:
+            self.hotkey_engine.mode = mode
 
 transcription_state = TranscriptionState()
-
-def check_hotkey_match(pressed_keys, target_combination):
-    # Normalize all pressed keys
-    pressed_str = {normalize_key(k) for k in pressed_keys}
-    print(f"Pressed keys: {pressed_str}")  # Debug print
-    print(f"Target combination: {target_combination}")  # Debug print
-    return pressed_str == target_combination
-
-def audio_preprocessing(audio_data):
-    # Convert bytes to numpy array
-    audio = np.frombuffer(audio_data, dtype=np.int16)
-    
-    # Convert to float32 for processing
-    audio = audio.astype(np.float32) / 32768.0
-    
-    # Boost the signal slightly
-    audio = audio * 1.2
-    
-    # Advanced noise gate with smoothing
-    noise_gate = 0.003
-    mask = abs(audio) > noise_gate
-    audio = audio * mask
-    
-    # Clip to prevent distortion
-    audio = np.clip(audio, -1.0, 1.0)
-    
-    # Convert back to int16
-    audio = (audio * 32768).astype(np.int16)
-    return audio.tobytes()
-
-# Keep existing callback function
-def callback(indata, frames, time, status):
-    if status:
-        print(status, file=sys.stderr)
-    q.put(bytes(indata))
+history_store = None  # Created in __main__ so importing this module doesn't touch ~/.parspeak
 
 # Keep existing record function unchanged
 def record(transcription_queue, control_event):
@@ -94,15 +65,7 @@ def record(transcription_queue, control_event):
         samplerate = 16000  # Optimal rate for Vosk small model
         device = None
 
-        # Update model path to point to the extracted folder
-        model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "vosk-model-fa-0.42")
-        if not os.path.exists(model_path):
-            print(f"Error: Model not found at {model_path}")
-            print("Please download the model from https://alphacephei.com/vosk/models")
-            print("Extract it to the 'models' folder in your script directory")
-            sys.exit(1)
-            
-        model = Model(model_path=model_path)
+        model = load_model()
 
         # Set dump_fn to None
         dump_fn = None
@@ -110,78 +73,108 @@ def record(transcription_queue, control_event):
         # Get the window instance from QApplication
         window = QApplication.instance().window
         device = window.selected_device if window.selected_device is not None else None
+        device_name = sd.query_devices(device, "input")["name"]
 
-        with sd.RawInputStream(samplerate=samplerate, 
-                             blocksize=4000,  # Smaller chunks for more frequent updates
-                             device=device,
-                             dtype="int16",
-                             channels=1,
-                             callback=callback):
-            print("#" * 80)
-            print("Press 'Ctrl+Shift+S' to start/stop the recording")
-            print("#" * 80)
+        # Smaller chunks for more frequent updates
+        with MicrophoneSource(device=device, samplerate=samplerate, blocksize=4000) as source:
+            logger.info("Press 'Ctrl+Shift+S' to start/stop the recording")
+            # Checked once so disabled debug logging costs nothing in the loop
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
             rec = None  # Move recognizer outside the recording logic
             recording = False
             prev_recording = False
             break_loop = False  # Add a flag to exit the loop
             audio_data = []  # Add buffer for audio data
+            end_of_speech = False  # Set by the silence detector until the next decode
             recording_start_time = None
+            preprocessor = AudioPreprocessor(samplerate=samplerate)
+            profile = PROFILES[DEFAULT_PROFILE]
+            silence_detector = SilenceDetector(profile, samplerate)
 
             def clear_audio_state():
-                nonlocal rec, audio_data, recording_start_time
-                while not q.empty():
-                    _ = q.get()  # Clear the queue
+                nonlocal rec, audio_data, recording_start_time, end_of_speech
+                source.clear()  # Discard buffered audio
                 rec = None
                 audio_data = []
+                end_of_speech = False
                 recording_start_time = None
+                preprocessor.reset()
+                silence_detector.reset()
                 # Don't clear full_result here anymore
 
-            pressed_keys = set()
-            def on_press(key):
-                nonlocal recording, break_loop, pressed_keys, rec, audio_data, recording_start_time
-                key_str = normalize_key(key)
-                print(f"Key pressed: {key_str}")  # Debug print
-                pressed_keys.add(key)
-                
+            # The hotkey engine runs on the pynput thread and only queues
+            # commands; starting and stopping happen on this thread
+            commands = queue.Queue()
+            hotkey_engine = HotkeyEngine(transcription_state.hotkey_combination,
+                                         on_start=lambda: commands.put("start"),
+                                         on_stop=lambda: commands.put("stop"),
+                                         mode=transcription_state.hotkey_mode)
+            transcription_state.hotkey_engine = hotkey_engine
+
+            # Types segments into the focused window once they are final
+            injector = TextInjector(keys_held=hotkey_engine.keys_held)
+            injecting = False
+
+            def handle_command(command):
+                nonlocal recording, rec, audio_data, recording_start_time
+                nonlocal profile, silence_detector, injecting
                 try:
-                    if check_hotkey_match(pressed_keys, transcription_state.hotkey_combination):
-                        print("Hotkey match detected!")  # Debug print
+                    if command == ("start" if not recording else "stop"):
                         recording = not recording
                         if recording:
                             # Only clear full_result when starting a new recording
-                            transcription_state.full_result = []
+                            transcription_state.full_result.clear()
                             transcription_state.current_partial = ""
+                            profile = PROFILES.get(transcription_state.endpoint_profile, PROFILES[DEFAULT_PROFILE])
+                            silence_detector = SilenceDetector(profile, samplerate)
                             clear_audio_state()
                             rec = KaldiRecognizer(model, samplerate)
+                            apply_endpointing(rec, profile)
+                            injecting = transcription_state.output_mode != "clipboard"
+                            if injecting:
+                                injector.replace_partials = transcription_state.output_mode == "type_partials"
+                                injector.start()
+                                injector.reset()
                             recording_start_time = datetime.now()
-                            print("Recording started...")
+                            logger.info("Recording started")
                             # Signal the main thread to show the window
                             transcription_queue.put(("show", None))
                         else:
-                            print("Recording stopped...")
+                            logger.info("Recording stopped")
                             current_rec = rec  # Store current recognizer
                             if current_rec is not None:  # Check if rec exists
                                 time.sleep(0.2)  # Slightly longer delay before processing
                                 try:
-                                    # Process any remaining audio in the queue
-                                    while not q.empty():
-                                        data = q.get()
+                                    # Process audio batched for the next decode, then the queue
+                                    if audio_data:
+                                        current_rec.AcceptWaveform(b''.join(audio_data))
+                                    data = source.read(timeout=0)
+                                    while data is not None:
                                         current_rec.AcceptWaveform(data)
+                                        data = source.read(timeout=0)
                                     
                                     final = current_rec.FinalResult()
                                     final_dict = json.loads(final)
                                     if final_dict.get("text"):
-                                        transcription_state.full_result.append(final_dict["text"])
-                                    transcription = " ".join(filter(None, transcription_state.full_result))
+                                        segment = normalize_segment(final_dict["text"])
+                                        transcription_state.full_result.append(segment)
+                                        if injecting:
+                                            injector.commit(segment)
+                                    # Stream the whole session back from disk for the clipboard
+                                    transcription = transcription_state.full_result.full_text()
                                     if transcription:  # Only process if we have text
-                                        print("Transcription:", transcription)
+                                        logger.debug("Transcription: %s", transcription)
                                         # Send transcription to GUI thread for clipboard operation
                                         transcription_queue.put(("copy", transcription))
-                                        # Send final transcription to the GUI
-                                        transcription_queue.put(("update", transcription))
+                                        # Queue for the history store; written off this thread
+                                        duration = (datetime.now() - recording_start_time).total_seconds() if recording_start_time else None
+                                        if history_store is not None:
+                                            history_store.add(transcription, duration=duration, device=device_name)
+                                        # Send only the recent tail to the GUI
+                                        transcription_queue.put(("update", transcription_state.full_result.tail_text()))
                                 except Exception as e:
-                                    print("Error processing final audio:", str(e))
+                                    logger.error("Error processing final audio: %s", e)
                                 finally:
                                     clear_audio_state()
                             # Signal the main thread to hide the window
@@ -189,47 +182,67 @@ def record(transcription_queue, control_event):
                 except AttributeError:
                     pass
 
-            def on_release(key):
-                if key in pressed_keys:
-                    pressed_keys.remove(key)
-
-            listener = keyboard.Listener(on_press=on_press, on_release=on_release)
-            listener.start()  # Start the listener outside the loop
+            hotkey_engine.start()  # Start the listener outside the loop
 
             try:
                 while not control_event.is_set():  # Change break_loop to use control_event
+                    # Wait for the hotkey while idle instead of sleeping
+                    try:
+                        handle_command(commands.get(block=not recording, timeout=0.1))
+                    except queue.Empty:
+                        pass
                     if recording and rec is not None:  # Ensure rec exists
                         try:
-                            if not q.empty():
-                                data = q.get()
-                                processed_data = audio_preprocessing(data)
+                            data = source.read(timeout=0.05)
+                            if data is not None:
+                                # Detect silence on the raw input; the AGC output has no fixed level
+                                if silence_detector.update(data):
+                                    end_of_speech = True
+                                processed_data = preprocessor.process(data)
                                 
                                 # Accumulate small chunks before processing
                                 audio_data.append(processed_data)
                                 
-                                # Process in larger chunks for better accuracy
-                                if len(audio_data) >= 4:  # Process every 4 chunks
+                                # Process in larger chunks for better accuracy; the profile sets the size
+                                result = None
+                                if len(audio_data) >= profile.decode_blocks:
                                     combined_data = b''.join(audio_data)
                                     if rec.AcceptWaveform(combined_data):
                                         result = rec.Result()
-                                        if result and len(result) > 2:
-                                            result_dict = json.loads(result)
-                                            if "text" in result_dict and result_dict["text"]:
-                                                transcription_state.full_result.append(result_dict["text"])
-                                                transcription = " ".join(filter(None, transcription_state.full_result))
-                                                if transcription_state.current_partial:
-                                                    transcription += " " + transcription_state.current_partial
-                                                transcription_queue.put(("update", transcription))
+                                        # The model ended the utterance; start counting afresh
+                                        silence_detector.reset()
+                                    elif end_of_speech:
+                                        # Our silence detector can end the utterance before the model does
+                                        result = rec.FinalResult()
+                                    end_of_speech = False
                                     audio_data = []  # Clear processed chunks
-                                
+
+                                if result is not None:
+                                    if len(result) > 2:
+                                        result_dict = json.loads(result)
+                                        if "text" in result_dict and result_dict["text"]:
+                                            segment = normalize_segment(result_dict["text"])
+                                            transcription_state.full_result.append(segment)
+                                            if injecting:
+                                                injector.commit(segment)
+                                            # The partial is now part of the final result
+                                            transcription_state.current_partial = ""
+                                            transcription = transcription_state.full_result.tail_text()
+                                            transcription_queue.put(("update", transcription))
+
                                 # Only show partial results after minimum duration
                                 elif recording_start_time and (datetime.now() - recording_start_time).total_seconds() >= MIN_RECORDING_DURATION:
                                     partial = rec.PartialResult()
                                     if partial and len(partial) > 2:
                                         partial_dict = json.loads(partial)
                                         if "partial" in partial_dict:
-                                            transcription_state.current_partial = partial_dict["partial"]
-                                            transcription = " ".join(filter(None, transcription_state.full_result))
+                                            # Normalized like the finals so committing keeps the typed prefix
+                                            transcription_state.current_partial = normalize_segment(partial_dict["partial"])
+                                            if debug_enabled:
+                                                logger.debug("Partial: %s", transcription_state.current_partial)
+                                            if injecting:
+                                                injector.partial(transcription_state.current_partial)
+                                            transcription = transcription_state.full_result.tail_text()
                                             if transcription_state.current_partial:
                                                 transcription += " " + transcription_state.current_partial
                                             transcription_queue.put(("update", transcription))
@@ -237,29 +250,31 @@ def record(transcription_queue, control_event):
                                 if dump_fn is not None:
                                     dump_fn.write(processed_data)
                         except Exception as e:
-                            print("Error processing audio frame:", str(e))
+                            logger.error("Error processing audio frame: %s", e)
                     else:
                         if prev_recording and rec and audio_data:
                             try:
                                 final_result = rec.FinalResult()
                                 final_dict = json.loads(final_result)
                                 if "text" in final_dict and final_dict["text"]:
-                                    transcription_state.full_result.append(final_dict["text"])
-                                    transcription = " ".join(filter(None, transcription_state.full_result))
-                                    print("Transcription:", transcription)
+                                    transcription_state.full_result.append(normalize_segment(final_dict["text"]))
+                                    transcription = transcription_state.full_result.tail_text()
+                                    logger.debug("Transcription: %s", transcription)
                             except Exception as e:
-                                print("Error getting final result:", str(e))
+                                logger.error("Error getting final result: %s", e)
                             finally:
                                 audio_data = []
                                 rec = None
-                        time.sleep(0.1)  # Pause briefly to prevent high CPU usage
                     prev_recording = recording
             finally:
                 # Stop keyboard listener when recording stops
-                listener.stop()
+                hotkey_engine.stop()
+                injector.stop()
+                # Don't leave this session's transcript on disk
+                transcription_state.full_result.close()
 
     except KeyboardInterrupt:
-        print("\nDone")
+        logger.info("Done")
         sys.exit(0)
     except Exception as e:
         sys.exit(type(e).__name__ + ": " + str(e))
@@ -270,6 +285,10 @@ def record(transcription_queue, control_event):
 # Update the main section to use PyQt instead of Kivy
 if __name__ == '__main__':
     try:
+        # Log from a background thread so audio and key threads never block on I/O
+        setup_logging()
+        # Remove transcripts spilled by sessions that crashed
+        TranscriptLog.prune()
         transcription_queue = queue.Queue()
         control_event = threading.Event()
 
@@ -277,14 +296,18 @@ if __name__ == '__main__':
         try:
             device_info = sd.query_devices(None, "input")
             if device_info is None:
-                print("Error: No input device found")
+                logger.error("No input device found")
                 sys.exit(1)
         except sd.PortAudioError as e:
-            print(f"Error initializing audio: {e}")
+            logger.error("Error initializing audio: %s", e)
             sys.exit(1)
 
+        # Load the history and start its background writer
+        history_store = HistoryStore()
+        history_store.start()
+
         # Start recording thread
-        recording_thread = threading.Thread(target=record, args=(transcription_queue, control_event))
+        recording_thread = threading.Thread(target=record, name="recording", args=(transcription_queue, control_event))
         recording_thread.start()
 
         # Start Qt application
@@ -294,10 +317,10 @@ if __name__ == '__main__':
         script_dir = os.path.dirname(os.path.abspath(__file__))
         font_path = os.path.join(script_dir, "fonts", "Vazirmatn-Regular.ttf")
         
-        print(f"Looking for font at: {font_path}")
+        logger.debug("Looking for font at: %s", font_path)
         
         if not os.path.exists(font_path):
-            print(f"Error: Font file not found at {font_path}")
+            logger.warning("Font file not found at %s", font_path)
             # Try alternative locations
             alt_paths = [
                 "./fonts/Vazirmatn-Regular.ttf",
@@ -308,29 +331,30 @@ if __name__ == '__main__':
             for alt_path in alt_paths:
                 if (os.path.exists(alt_path)):
                     font_path = alt_path
-                    print(f"Found font at alternative location: {font_path}")
+                    logger.info("Found font at alternative location: %s", font_path)
                     break
             else:
-                print("Using system font as fallback")
+                logger.warning("Using system font as fallback")
                 font_family = "Arial"
         
         if 'font_family' not in locals():  # Only load font if we haven't set a fallback
             font_id = QFontDatabase.addApplicationFont(font_path)
             if font_id < 0:
-                print(f"Error: Failed to load font from {font_path}")
+                logger.error("Failed to load font from %s", font_path)
                 font_family = "Arial"
             else:
                 font_families = QFontDatabase.applicationFontFamilies(font_id)
                 if not font_families:
-                    print("Error: No font families found in the font file")
+                    logger.error("No font families found in the font file")
                     font_family = "Arial"
                 else:
                     font_family = font_families[0]
-                    print(f"Successfully loaded font family: {font_family}")
+                    logger.debug("Loaded font family: %s", font_family)
 
         # Create window with loaded font
         window = TranscriptionWindow(transcription_queue, control_event, font_family)
         window.transcription_state = transcription_state  # Add this line to pass the reference
+        window.history_store = history_store
         
         # Keep reference to window and app
         app.window = window  # Prevent garbage collection
@@ -345,10 +369,10 @@ if __name__ == '__main__':
         # Check if we have the full model
         model_path = os.path.join(script_dir, "model")
         if not os.path.exists(model_path):
-            print("Warning: Full model not found. Please download the complete model for better accuracy.")
-            print("Visit https://alphacephei.com/vosk/models and download the Persian model")
-            print("Extract it to a 'model' folder in your script directory")
+            logger.warning("Full model not found. Please download the complete model for better accuracy.")
+            logger.warning("Visit https://alphacephei.com/vosk/models and download the Persian model")
+            logger.warning("Extract it to a 'model' folder in your script directory")
 
     except Exception as e:
-        print(f"Fatal error: {e}")
+        logger.critical("Fatal error: %s", e)
         sys.exit(1)
\ No newline at end of file
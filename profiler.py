@@ -0,0 +1,116 @@
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from transcript.paths import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+    """Bounded-time sampling profiler for selected threads.
+
+    Nothing runs until ``start`` is called. While active, a daemon thread
+    samples the stacks of the named threads at a fixed interval and
+    tracemalloc records allocations. When stopped, or after
+    ``max_duration`` seconds, it writes a flamegraph-compatible collapsed
+    stack file and a top-allocations summary to a timestamped folder.
+    """
+
+    def __init__(self, thread_names=("MainThread", "recording"), interval=0.005,
+                 max_duration=60.0, top_allocations=30, output_dir=None):
+        self.thread_names = thread_names
+        self.interval = interval
+        self.max_duration = max_duration
+        self.top_allocations = top_allocations
+        self.output_dir = output_dir or os.path.join(DATA_DIR, "profiles")
+        self.last_report_dir = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=False):
+        """Stop sampling; reports are written by the sampler thread"""
+        self._stop_event.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def toggle(self):
+        if self.is_running:
+            self.stop()
+        else:
+            self.start()
+
+    def _target_threads(self):
+        return {t.ident: t.name for t in threading.enumerate() if t.name in self.thread_names}
+
+    def _run(self):
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(25)
+        stacks = Counter()
+        samples = 0
+        start = time.monotonic()
+        deadline = start + self.max_duration
+        targets = self._target_threads()
+        logger.info("Profiling started for threads: %s", ", ".join(sorted(targets.values())))
+
+        while not self._stop_event.wait(self.interval) and time.monotonic() < deadline:
+            frames = sys._current_frames()
+            for ident, name in targets.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    stacks[self._collapse(name, frame)] += 1
+            samples += 1
+
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracemalloc:
+            tracemalloc.stop()
+        self._write_reports(stacks, snapshot, samples, time.monotonic() - start)
+
+    def _collapse(self, thread_name, frame):
+        # Root first, as expected by flamegraph.pl and speedscope
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        parts.append(thread_name)
+        return ";".join(reversed(parts))
+
+    def _write_reports(self, stacks, snapshot, samples, elapsed):
+        report_dir = os.path.join(self.output_dir, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        try:
+            os.makedirs(report_dir, exist_ok=True)
+            with open(os.path.join(report_dir, "stacks.collapsed"), "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+            snapshot = snapshot.filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+            with open(os.path.join(report_dir, "allocations.txt"), "w", encoding="utf-8") as f:
+                f.write(f"Profiled {elapsed:.1f}s, {samples} samples every {self.interval * 1000:.0f}ms\n\n")
+                f.write(f"Top {self.top_allocations} allocation sites:\n")
+                for stat in snapshot.statistics("lineno")[:self.top_allocations]:
+                    f.write(f"{stat}\n")
+            self.last_report_dir = report_dir
+            logger.info("Profiling report written to %s", report_dir)
+        except OSError as e:
+            logger.error("Error writing profiling report: %s", e)
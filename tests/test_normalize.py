@@ -0,0 +1,34 @@
+from transcript.normalize import ZWNJ, normalize_segment
+
+
+def test_compound_numbers_become_digits():
+    assert normalize_segment("بیست و پنج") == "۲۵"
+    assert normalize_segment("صد و بیست و سه نفر") == "۱۲۳ نفر"
+    assert normalize_segment("دو هزار و پانصد") == "۲۵۰۰"
+    assert normalize_segment("سه میلیون و دویست هزار") == "۳۲۰۰۰۰۰"
+    assert normalize_segment("بیست و نه سال") == "۲۹ سال"
+
+
+def test_lone_units_stay_words():
+    assert normalize_segment("یک روز") == "یک روز"
+    assert normalize_segment("نه") == "نه"
+
+
+def test_runs_that_are_not_one_number_stay_words():
+    assert normalize_segment("نه نه") == "نه نه"
+    assert normalize_segment("دو سه روز") == "دو سه روز"
+    assert normalize_segment("دو و سه") == "دو و سه"
+    assert normalize_segment("یازده و سه") == "یازده و سه"
+
+
+def test_suffix_keeps_number_word():
+    assert normalize_segment("ده ها") == "ده" + ZWNJ + "ها"
+    assert normalize_segment("صد ها نفر") == "صد" + ZWNJ + "ها نفر"
+    # Already joined with a ZWNJ
+    assert normalize_segment("ده" + ZWNJ + "ها") == "ده" + ZWNJ + "ها"
+
+
+def test_zwnj_and_characters():
+    assert normalize_segment("می رود") == "می" + ZWNJ + "رود"
+    assert normalize_segment("کتاب ها") == "کتاب" + ZWNJ + "ها"
+    assert normalize_segment("كتاب") == "کتاب"
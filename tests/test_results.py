@@ -0,0 +1,50 @@
+import json
+
+from transcript.results import RecognitionResult, ResultStore, Vocabulary, default_vocabulary
+
+
+def _result_json(words, start=0.0):
+    return json.dumps({
+        "text": " ".join(words),
+        "result": [{"word": w, "start": start + i, "end": start + i + 0.5, "conf": 0.5 + 0.1 * i}
+                   for i, w in enumerate(words)],
+    })
+
+
+def test_from_json_interns_into_given_vocabulary():
+    vocabulary = Vocabulary()
+    result = RecognitionResult.from_json(_result_json(["سلام", "دنیا"]), vocabulary=vocabulary)
+    assert result.vocabulary is vocabulary
+    assert vocabulary.words == ["سلام", "دنیا"]
+    assert result.words == ["سلام", "دنیا"]
+    assert (result.start, result.end) == (0.0, 1.5)
+
+
+def test_from_json_offset_and_text_only():
+    result = RecognitionResult.from_json(_result_json(["یک"], start=1.0), offset=10.0)
+    assert result.start == 11.0
+    text_only = RecognitionResult.from_json('{"text": "سلام"}')
+    assert text_only and len(text_only) == 0 and text_only.start is None
+    assert not RecognitionResult.from_json('{"text": ""}')
+
+
+def test_store_keeps_its_own_vocabulary():
+    vocabulary = Vocabulary()
+    store = ResultStore(vocabulary)
+    assert store.vocabulary is vocabulary
+    assert ResultStore().vocabulary is default_vocabulary
+
+
+def test_store_segments_and_words_between():
+    store = ResultStore(Vocabulary())
+    # Parsed into another vocabulary, so the store re-interns the words
+    store.append(RecognitionResult.from_json(_result_json(["الف", "ب", "پ"]), vocabulary=Vocabulary()))
+    store.append(RecognitionResult.from_json(_result_json(["ت", "الف"], start=5.0), vocabulary=store.vocabulary))
+    assert len(store) == 2
+    assert store.vocabulary.words == ["الف", "ب", "پ", "ت"]
+    words, starts, ends, _ = store.segment_words(1)
+    assert words == ["ت", "الف"]
+    assert list(starts) == [5.0, 6.0]
+    assert store.words_between(0.6, 5.2) == ["ب", "پ", "ت"]
+    assert store.words_between(0.0, 10.0, min_confidence=0.6) == ["ب", "پ", "الف"]
+    assert "00:00:05,000 --> 00:00:06,500" in store.srt()
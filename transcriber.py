@@ -0,0 +1,152 @@
+"""Headless transcription from any audio source.
+
+Examples:
+    arecord -f S16_LE -r 16000 -c 1 -t raw | python transcriber.py -
+    ffmpeg -i talk.mp3 -ar 16000 -ac 1 -f s16le - | python transcriber.py -
+    python transcriber.py recording.wav
+    python transcriber.py fifo:/tmp/parspeak.pcm
+    python transcriber.py mic --device 1 --device 3   # several microphones at once
+    python transcriber.py talk.wav --format srt > talk.srt
+
+As a library, ``transcribe`` returns a ResultStore with word timings:
+
+    store = transcribe(WavFileSource("talk.wav"), load_model())
+    store.words_between(10.0, 20.0, min_confidence=0.6)
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+from vosk import Model, KaldiRecognizer
+
+from audio import (
+    AudioPreprocessor, MultiDeviceTranscriber, PROFILES, DEFAULT_PROFILE, SilenceDetector,
+    apply_endpointing, open_source
+)
+from transcript import RecognitionResult, ResultStore, normalize_segment
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "vosk-model-fa-0.42")
+
+
+def load_model(model_path=MODEL_PATH):
+    """Load the Vosk model, exiting with instructions if it is missing"""
+    if not os.path.exists(model_path):
+        logger.error("Model not found at %s", model_path)
+        logger.error("Please download the model from https://alphacephei.com/vosk/models")
+        logger.error("Extract it to the 'models' folder in your script directory")
+        sys.exit(1)
+    return Model(model_path=model_path)
+
+
+def transcribe(source, model, on_result=None, preprocess=True, profile=DEFAULT_PROFILE):
+    """Decode a source until it ends.
+
+    Each final RecognitionResult is passed to on_result as it arrives, and
+    all of them are returned in a ResultStore.
+    """
+    profile = PROFILES[profile]
+    store = ResultStore()
+
+    def commit(result_json):
+        result = RecognitionResult.from_json(result_json)
+        if result:
+            store.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    with source:
+        rec = KaldiRecognizer(model, source.samplerate)
+        rec.SetWords(True)
+        apply_endpointing(rec, profile)
+        silence_detector = SilenceDetector(profile, source.samplerate)
+        preprocessor = AudioPreprocessor(samplerate=source.samplerate) if preprocess else None
+        for block in source:
+            # Detect silence on the raw block; the AGC output has no fixed level
+            finalize = silence_detector.update(block)
+            data = preprocessor.process(block) if preprocessor else bytes(block)
+            if rec.AcceptWaveform(data):
+                commit(rec.Result())
+                silence_detector.reset()
+            elif finalize:
+                commit(rec.FinalResult())
+        commit(rec.FinalResult())
+    return store
+
+
+def transcribe_many(sources, model, on_segment, preprocess=True, max_workers=None):
+    """Decode several labeled sources concurrently until they all end"""
+    transcriber = MultiDeviceTranscriber(model, sources, on_segment=on_segment,
+                                         max_workers=max_workers, preprocess=preprocess)
+    transcriber.start()
+    try:
+        transcriber.wait()
+    except KeyboardInterrupt:
+        transcriber.stop()
+    return transcriber.transcript()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe Persian speech without the GUI")
+    parser.add_argument("inputs", nargs="+", metavar="input",
+                        help="'mic', '-' for stdin, 'fifo:PATH', or a .wav/raw PCM file")
+    parser.add_argument("--model", default=MODEL_PATH, help="path to the Vosk model folder")
+    parser.add_argument("--samplerate", type=int, default=16000, help="sample rate of raw input")
+    parser.add_argument("--device", type=int, action="append", default=None,
+                        help="input device index for 'mic'; repeat to capture several devices")
+    parser.add_argument("--workers", type=int, default=None, help="decoder threads for several inputs")
+    parser.add_argument("--paced", action="store_true", help="read files at real-time speed")
+    parser.add_argument("--endpointing", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help="how eagerly utterances are finalized")
+    parser.add_argument("--format", choices=("text", "json", "srt"), default="text",
+                        help="text lines, JSON lines with word timings, or SubRip subtitles (one input)")
+    parser.add_argument("--no-preprocess", action="store_true", help="skip gain control and noise gate")
+    args = parser.parse_args()
+
+    # Transcripts go to stdout; diagnostics go through logging to stderr
+    setup_logging()
+    model = load_model(args.model)
+    sources = []
+    for spec in args.inputs:
+        if spec == "mic" and args.device:
+            for device in args.device:
+                sources.append((f"mic{device}", open_source(spec, samplerate=args.samplerate, device=device)))
+        else:
+            sources.append((spec, open_source(spec, samplerate=args.samplerate, paced=args.paced)))
+
+    def print_result(result, label=None):
+        if args.format == "json":
+            record = result.to_dict()
+            record["text"] = normalize_segment(result.text)
+            if label is not None:
+                record["source"] = label
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+        elif args.format == "text":
+            prefix = f"[{result.start or 0.0:8.2f}] {label}: " if label is not None else ""
+            print(prefix + normalize_segment(result.text), flush=True)
+
+    if len(sources) == 1:
+        store = None
+        try:
+            store = transcribe(sources[0][1], model, print_result,
+                               preprocess=not args.no_preprocess, profile=args.endpointing)
+        except KeyboardInterrupt:
+            pass
+        if store is not None and args.format == "srt":
+            print(store.srt())
+        return
+
+    # Several inputs: label each segment with its source
+    def print_segment(segment):
+        print_result(segment.result, segment.label)
+
+    transcribe_many(sources, model, print_segment, preprocess=not args.no_preprocess,
+                    max_workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
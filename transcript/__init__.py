@@ -0,0 +1,9 @@
+from .history import HistoryStore
+from .normalize import normalize_segment
+from .results import RecognitionResult, ResultStore, Vocabulary
+from .session_log import TranscriptLog
+
+__all__ = [
+    'HistoryStore', 'TranscriptLog', 'normalize_segment',
+    'RecognitionResult', 'ResultStore', 'Vocabulary'
+]
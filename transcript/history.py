@@ -0,0 +1,153 @@
+import bisect
+import json
+import logging
+import queue
+import re
+import threading
+import time
+
+from .normalize import ZWNJ, _CHARACTER_TABLE
+from .paths import data_path
+
+logger = logging.getLogger(__name__)
+
+# Fold the same characters as normalize_segment so searches match either form;
+# ZWNJ also splits compound words into searchable parts
+_SEARCH_FOLD = {**_CHARACTER_TABLE, ord(ZWNJ): " ", ord("\u0670"): None}
+_TOKEN = re.compile(r"\w+")
+
+
+def fold_for_search(text):
+    """Normalize text for indexing and querying"""
+    return _TOKEN.findall(text.translate(_SEARCH_FOLD).lower())
+
+
+class HistoryStore:
+    """Append-only transcription history with an incremental full-text index.
+
+    Entries are appended as JSON lines. Writes go through a queue and are
+    flushed in batches by a background thread, so callers on the GUI and
+    decoder threads never touch the disk. The inverted index is updated as
+    entries are added and searched in memory.
+    """
+
+    def __init__(self, path=None, batch_size=20, flush_interval=2.0):
+        self.path = path or data_path("history.jsonl")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.entries = []
+        self._postings = {}   # token -> list of entry ids, in insertion order
+        self._vocabulary = []  # sorted tokens for prefix lookups
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._thread = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except ValueError:
+                        continue  # Skip a torn last line after a crash
+        except FileNotFoundError:
+            pass
+
+    def _index(self, entry):
+        entry_id = len(self.entries)
+        self.entries.append(entry)
+        for token in set(fold_for_search(entry.get("text", ""))):
+            ids = self._postings.get(token)
+            if ids is None:
+                self._postings[token] = [entry_id]
+                bisect.insort(self._vocabulary, token)
+            else:
+                ids.append(entry_id)
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Flush pending entries and stop the writer thread"""
+        if self._thread is not None:
+            self._pending.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def add(self, text, duration=None, device=None):
+        """Queue a final transcription for storage and indexing"""
+        if not text:
+            return
+        self._pending.put({
+            "timestamp": time.time(),
+            "duration": duration,
+            "device": device,
+            "text": text,
+        })
+
+    def _writer(self):
+        running = True
+        while running:
+            batch = []
+            try:
+                item = self._pending.get(timeout=self.flush_interval)
+                if item is None:
+                    running = False
+                else:
+                    batch.append(item)
+                    # Gather whatever else is already waiting
+                    while len(batch) < self.batch_size:
+                        item = self._pending.get_nowait()
+                        if item is None:
+                            running = False
+                            break
+                        batch.append(item)
+            except queue.Empty:
+                pass
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for entry in batch:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error("Error writing transcription history: %s", e)
+        with self._lock:
+            for entry in batch:
+                self._index(entry)
+
+    def _matching_ids(self, token, prefix):
+        if not prefix:
+            return set(self._postings.get(token, ()))
+        ids = set()
+        vocabulary = self._vocabulary
+        # Walk by index; slicing would copy the rest of the vocabulary per keystroke
+        for i in range(bisect.bisect_left(vocabulary, token), len(vocabulary)):
+            candidate = vocabulary[i]
+            if not candidate.startswith(token):
+                break
+            ids.update(self._postings[candidate])
+        return ids
+
+    def search(self, query, limit=100):
+        """Return the newest entries containing every word of the query.
+
+        The last word is matched as a prefix so results update while typing.
+        """
+        tokens = fold_for_search(query)
+        with self._lock:
+            if not tokens:
+                return self.entries[-limit:][::-1]
+            ids = None
+            for i, token in enumerate(tokens):
+                matches = self._matching_ids(token, prefix=i == len(tokens) - 1)
+                ids = matches if ids is None else ids & matches
+                if not ids:
+                    return []
+            return [self.entries[i] for i in sorted(ids, reverse=True)[:limit]]
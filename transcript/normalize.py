@@ -0,0 +1,106 @@
+import re
+
+ZWNJ = "\u200c"
+
+# Character unification, done with a single str.translate call
+_CHARACTER_TABLE = str.maketrans({
+    "ي": "ی",  # Arabic yeh -> Persian yeh
+    "ى": "ی",  # Alef maksura -> Persian yeh
+    "ك": "ک",  # Arabic kaf -> Persian kaf
+    "ة": "ه",  # Teh marbuta -> heh
+    "\u200d": None,  # ZWJ
+    "\u0640": None,  # Tatweel
+    **{chr(c): None for c in range(0x064B, 0x0653)},  # Harakat
+    # Arabic-Indic digits -> Persian digits
+    **{chr(0x0660 + i): chr(0x06F0 + i) for i in range(10)},
+})
+_PERSIAN_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
+
+_UNITS = {
+    "یک": 1, "دو": 2, "سه": 3, "چهار": 4, "پنج": 5,
+    "شش": 6, "شیش": 6, "هفت": 7, "هشت": 8, "نه": 9,
+}
+_TEENS_AND_TENS = {
+    "ده": 10, "یازده": 11, "دوازده": 12, "سیزده": 13, "چهارده": 14,
+    "پانزده": 15, "پونزده": 15, "شانزده": 16, "شونزده": 16, "هفده": 17,
+    "هیفده": 17, "هجده": 18, "هیجده": 18, "نوزده": 19,
+    "بیست": 20, "سی": 30, "چهل": 40, "پنجاه": 50,
+    "شصت": 60, "هفتاد": 70, "هشتاد": 80, "نود": 90,
+}
+_HUNDREDS = {
+    "صد": 100, "یکصد": 100, "دویست": 200, "سیصد": 300, "چهارصد": 400,
+    "پانصد": 500, "پونصد": 500, "ششصد": 600, "هفتصد": 700, "هشتصد": 800,
+    "نهصد": 900,
+}
+_SCALES = {"هزار": 1000, "میلیون": 10 ** 6, "میلیارد": 10 ** 9}
+_NUMBER_WORDS = {**_UNITS, **_TEENS_AND_TENS, **_HUNDREDS, **_SCALES}
+
+_NUMBER_WORD = "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True))
+_SUFFIXES = "هایی|هایم|هایت|هایش|هایمان|هایتان|هایشان|های|ها|ترین"
+
+# One pass handles ZWNJ placement and spoken numbers; each alternative is
+# a named group so the callback knows which rule matched
+_PATTERN = re.compile(
+    rf"(?P<prefix>\b(?:ن?می))\s+(?=\w)"
+    rf"|(?<=\w)\s+(?P<suffix>(?:{_SUFFIXES})\b)"
+    rf"|(?P<number>\b(?:{_NUMBER_WORD})(?:\s+(?:و\s+)?(?:{_NUMBER_WORD}))*\b)"
+)
+_NUMBER_TOKEN = re.compile(rf"(\s+(?:و\s+)?)?({_NUMBER_WORD})")
+_SUFFIX_AFTER = re.compile(rf"[\s{ZWNJ}]+(?:{_SUFFIXES})\b")
+
+
+def _parse_number(tokens):
+    """Read a run of number words as a single number, or None if it isn't one.
+
+    Parts of a group are joined with "و" and get smaller ("بیست و پنج");
+    a scale word multiplies the group before it ("دو هزار و پانصد").
+    """
+    total = current = 0
+    limit = None  # The next part of the group must stay below this
+    last_scale = None
+    for separator, word in tokens:
+        value = _NUMBER_WORDS[word]
+        joined = "و" in separator
+        if word in _SCALES:
+            if joined or (last_scale is not None and value >= last_scale):
+                return None
+            total += (current or 1) * value
+            current = 0
+            limit = last_scale = value
+        else:
+            # "دو سه" and "دو و سه" are two numbers, not one
+            if (separator and not joined) or (limit is not None and value >= limit):
+                return None
+            current += value
+            if 10 <= value < 20:
+                limit = 1
+            else:
+                digits = str(value)
+                limit = 10 ** (len(digits) - len(digits.rstrip("0")))
+    return total + current
+
+
+def _replace(match):
+    if match.group("prefix") is not None:
+        return match.group("prefix") + ZWNJ
+    if match.group("suffix") is not None:
+        return ZWNJ + match.group("suffix")
+    words = match.group("number")
+    # A suffix makes the run a word again ("ده‌ها", "صدها")
+    if _SUFFIX_AFTER.match(match.string, match.end()):
+        return words
+    tokens = _NUMBER_TOKEN.findall(words)
+    # Keep a lone small number as a word ("یک روز", "سه تا", "نه")
+    if len(tokens) == 1 and tokens[0][1] in _UNITS:
+        return words
+    number = _parse_number(tokens)
+    if number is None:
+        return words
+    return str(number).translate(_PERSIAN_DIGITS)
+
+
+def normalize_segment(text):
+    """Normalize a final recognizer segment for display and the clipboard"""
+    if not text:
+        return text
+    return _PATTERN.sub(_replace, text.translate(_CHARACTER_TABLE))
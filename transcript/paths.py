@@ -0,0 +1,11 @@
+import os
+
+# Per-user directory for everything Parspeak writes to disk
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".parspeak")
+
+
+def data_path(*parts):
+    """Return a path inside the data directory, creating parent folders"""
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -0,0 +1,175 @@
+import json
+import threading
+from array import array
+
+import numpy as np
+
+
+class Vocabulary:
+    """Interns recognized words as small integer ids"""
+
+    def __init__(self):
+        self.ids = {}
+        self.words = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.words)
+
+    def intern(self, word):
+        word_id = self.ids.get(word)
+        if word_id is None:
+            # Decoder threads may intern the same new word at once
+            with self._lock:
+                word_id = self.ids.get(word)
+                if word_id is None:
+                    self.words.append(word)
+                    word_id = self.ids[word] = len(self.words) - 1
+        return word_id
+
+
+# Shared by default so ids are comparable across results and sessions
+default_vocabulary = Vocabulary()
+
+
+class RecognitionResult:
+    """One final recognizer result, parsed once from the Vosk JSON.
+
+    Words are stored as vocabulary ids with start, end and confidence in
+    compact ``array`` columns; times are in seconds from the start of the
+    stream. Enable ``SetWords(True)`` on the recognizer to get timings;
+    without them only ``text`` is filled.
+    """
+
+    __slots__ = ("text", "word_ids", "starts", "ends", "confidences", "vocabulary")
+
+    def __init__(self, text="", vocabulary=None):
+        self.text = text
+        self.vocabulary = vocabulary if vocabulary is not None else default_vocabulary
+        self.word_ids = array("I")
+        self.starts = array("f")
+        self.ends = array("f")
+        self.confidences = array("f")
+
+    @classmethod
+    def from_json(cls, result_json, vocabulary=None, offset=0.0):
+        """Parse a Result() or FinalResult() string, shifting times by offset"""
+        data = json.loads(result_json) if result_json else {}
+        result = cls(data.get("text", ""), vocabulary)
+        intern = result.vocabulary.intern
+        for word in data.get("result", ()):
+            result.word_ids.append(intern(word["word"]))
+            result.starts.append(word["start"] + offset)
+            result.ends.append(word["end"] + offset)
+            result.confidences.append(word.get("conf", 1.0))
+        return result
+
+    def __len__(self):
+        return len(self.word_ids)
+
+    def __bool__(self):
+        return bool(self.text)
+
+    def __repr__(self):
+        return f"RecognitionResult({self.text!r}, {len(self)} words)"
+
+    @property
+    def words(self):
+        words = self.vocabulary.words
+        return [words[i] for i in self.word_ids]
+
+    @property
+    def start(self):
+        return self.starts[0] if self.starts else None
+
+    @property
+    def end(self):
+        return self.ends[-1] if self.ends else None
+
+    def columns(self):
+        """Zero-copy NumPy views of (word_ids, starts, ends, confidences)"""
+        return (np.frombuffer(self.word_ids, dtype=np.uint32),
+                np.frombuffer(self.starts, dtype=np.float32),
+                np.frombuffer(self.ends, dtype=np.float32),
+                np.frombuffer(self.confidences, dtype=np.float32))
+
+    def to_dict(self):
+        words = self.vocabulary.words
+        return {
+            "text": self.text,
+            "words": [
+                {"word": words[i], "start": round(s, 3), "end": round(e, 3), "conf": round(c, 3)}
+                for i, s, e, c in zip(self.word_ids, self.starts, self.ends, self.confidences)
+            ],
+        }
+
+
+class ResultStore:
+    """All words of a session in shared columns, with segment boundaries.
+
+    Appending a result copies its columns onto the session columns, so a
+    long transcript costs 16 bytes per word plus the shared vocabulary.
+    """
+
+    def __init__(self, vocabulary=None):
+        self.vocabulary = vocabulary if vocabulary is not None else default_vocabulary
+        self.word_ids = array("I")
+        self.starts = array("f")
+        self.ends = array("f")
+        self.confidences = array("f")
+        self.segment_offsets = array("I", [0])  # Word index where each segment starts
+
+    def __len__(self):
+        return len(self.segment_offsets) - 1
+
+    def append(self, result):
+        if result.vocabulary is not self.vocabulary:
+            ids = array("I", (self.vocabulary.intern(w) for w in result.words))
+        else:
+            ids = result.word_ids
+        self.word_ids.extend(ids)
+        self.starts.extend(result.starts)
+        self.ends.extend(result.ends)
+        self.confidences.extend(result.confidences)
+        self.segment_offsets.append(len(self.word_ids))
+
+    def columns(self):
+        """Zero-copy NumPy views of (word_ids, starts, ends, confidences)"""
+        return (np.frombuffer(self.word_ids, dtype=np.uint32),
+                np.frombuffer(self.starts, dtype=np.float32),
+                np.frombuffer(self.ends, dtype=np.float32),
+                np.frombuffer(self.confidences, dtype=np.float32))
+
+    def segment_words(self, index):
+        """Return (words, starts, ends, confidences) for one segment"""
+        begin, end = self.segment_offsets[index], self.segment_offsets[index + 1]
+        words = self.vocabulary.words
+        return ([words[i] for i in self.word_ids[begin:end]],
+                self.starts[begin:end], self.ends[begin:end], self.confidences[begin:end])
+
+    def words_between(self, start, end, min_confidence=0.0):
+        """Words overlapping [start, end) with at least the given confidence"""
+        word_ids, starts, ends, confidences = self.columns()
+        mask = (ends > start) & (starts < end) & (confidences >= min_confidence)
+        words = self.vocabulary.words
+        return [words[i] for i in word_ids[mask]]
+
+    def srt(self, words_per_line=7):
+        """Format the session as SubRip subtitles"""
+        def timestamp(seconds):
+            millis = int(round(seconds * 1000))
+            hours, millis = divmod(millis, 3600000)
+            minutes, millis = divmod(millis, 60000)
+            secs, millis = divmod(millis, 1000)
+            return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+        lines = []
+        words = self.vocabulary.words
+        for index in range(len(self)):
+            begin, end = self.segment_offsets[index], self.segment_offsets[index + 1]
+            for first in range(begin, end, words_per_line):
+                last = min(first + words_per_line, end) - 1
+                lines.append(f"{len(lines) + 1}\n"
+                             f"{timestamp(self.starts[first])} --> {timestamp(self.ends[last])}\n"
+                             f"{' '.join(words[i] for i in self.word_ids[first:last + 1])}\n")
+        return "\n".join(lines)
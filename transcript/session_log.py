@@ -0,0 +1,110 @@
+import glob
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from .paths import DATA_DIR, data_path
+
+
+class TranscriptLog:
+    """Committed transcript segments with a bounded in-memory window.
+
+    Only the most recent ``max_segments`` segments are kept in memory; older
+    ones are appended to a per-session file on disk, so memory stays flat no
+    matter how long a dictation runs. ``full_text`` streams the spilled part
+    back from disk when the whole transcript is needed. The file is removed
+    by ``clear`` and ``close``; ``prune`` removes ones left behind by a crash.
+    """
+
+    def __init__(self, max_segments=50, display_segments=8, directory=None):
+        self.max_segments = max_segments
+        self.display_segments = display_segments
+        self.directory = directory
+        self._segments = deque()
+        self._spill_file = None
+        self._spill_path = None
+        self._spilled_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return self._spilled_count + len(self._segments)
+
+    def append(self, text):
+        """Commit a final segment, spilling the oldest one if the window is full"""
+        if not text:
+            return
+        with self._lock:
+            self._segments.append(text)
+            while len(self._segments) > self.max_segments:
+                self._spill(self._segments.popleft())
+
+    def _spill(self, text):
+        if self._spill_file is None:
+            name = datetime.now().strftime("session-%Y%m%d-%H%M%S-%f.log")
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                self._spill_path = os.path.join(self.directory, name)
+            else:
+                self._spill_path = data_path("sessions", name)
+            self._spill_file = open(self._spill_path, "a", encoding="utf-8")
+        # Segments never contain newlines, so one line per segment
+        self._spill_file.write(text.replace("\n", " ") + "\n")
+        self._spill_file.flush()
+        self._spilled_count += 1
+
+    def tail_text(self):
+        """Return the recent segments shown in the overlay"""
+        with self._lock:
+            start = max(len(self._segments) - self.display_segments, 0)
+            return " ".join(self._segments[i] for i in range(start, len(self._segments)))
+
+    def iter_segments(self):
+        """Yield every committed segment, reading spilled ones from disk"""
+        with self._lock:
+            spill_path = self._spill_path
+            spilled_count = self._spilled_count
+            segments = list(self._segments)
+        if spill_path is not None:
+            # Stop at the snapshot so segments spilled meanwhile aren't repeated
+            with open(spill_path, "r", encoding="utf-8") as f:
+                for _, line in zip(range(spilled_count), f):
+                    yield line.rstrip("\n")
+        yield from segments
+
+    def full_text(self):
+        """Build the whole transcript, streaming older segments from disk"""
+        return " ".join(self.iter_segments())
+
+    def clear(self):
+        """Start a new session and remove the previous spill file"""
+        with self._lock:
+            self._segments.clear()
+            self._spilled_count = 0
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+            if self._spill_path is not None:
+                try:
+                    os.remove(self._spill_path)
+                except OSError:
+                    pass
+                self._spill_path = None
+
+    def close(self):
+        """End the session, e.g. on exit, and remove its spill file"""
+        self.clear()
+
+    @staticmethod
+    def prune(directory=None, max_age=24 * 3600):
+        """Remove spill files older than max_age seconds left by earlier runs"""
+        directory = directory or os.path.join(DATA_DIR, "sessions")
+        cutoff = time.time() - max_age
+        for path in glob.glob(os.path.join(directory, "session-*.log")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass